@@ -8,11 +8,19 @@ Coordinate values of points and vectors can generally be any real number. For
 many applications, however, it is natural to use only integral points. In the
 context of this module, a *grid* is a mapping from integral points to values
 of any type.
+
+For rectangular grids of small integers, the class Grid offers a dense
+representation that needs far less memory than a dict or set of points.
 """
 
+import array
+import itertools
 import numbers
+import sys
 import typing
 
+from adventkit import helpers
+
 
 class Vector2D(typing.NamedTuple):
     """An immutable vector or point in 2D space.
@@ -160,6 +168,372 @@ RIGHT = EAST = Vector2D(+1, 0)
 UP = NORTH = Vector2D(0, -1)
 DOWN = SOUTH = Vector2D(0, +1)
 
+ORTHOGONAL_STEPS = LEFT, UP, DOWN, RIGHT
+ALL_STEPS = tuple(ORIGIN_2D.neighbors())
+
+
+class Grid:
+    """A dense rectangular grid of small integers, backed by a bytearray.
+
+    A Grid has a fixed `width` and `height`. Every cell holds an integer from 0
+    to 255, initially `fill`. The cell at point (x, y), where 0 <= x < width
+    and 0 <= y < height, is stored at index y*width + x of the bytearray
+    `cells`.
+
+    Cells are read and written by indexing with points, for example
+    grid[x, y] = 1. If `wrap` is true, points outside the grid wrap around, as
+    if the grid were repeated infinitely in all directions. Otherwise, points
+    outside the grid raise an IndexError.
+    """
+
+    def __init__(self, width, height, fill=0, *, wrap=False):
+        if width < 0 or height < 0:
+            raise ValueError("grid dimensions can't be negative")
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.cells = bytearray([fill]) * (width * height)
+
+    def __repr__(self):
+        return f"Grid(width={self.width}, height={self.height})"
+
+    def __getitem__(self, point):
+        return self.cells[self.index(point)]
+
+    def __setitem__(self, point, value):
+        self.cells[self.index(point)] = value
+
+    @property
+    def size(self):
+        """The size of the grid as a Vector2D instance."""
+        return Vector2D(self.width, self.height)
+
+    def index(self, point):
+        """Return the index of a point's cell within `cells`."""
+
+        x, y = point
+        if self.wrap:
+            x %= self.width
+            y %= self.height
+        elif not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"point {point} outside of grid")
+        return y * self.width + x
+
+    def point(self, index):
+        """Return the point whose cell has the given index within `cells`."""
+
+        y, x = divmod(index, self.width)
+        return Vector2D(x, y)
+
+    def neighbor_indices(self, index, *, diagonal=True):
+        """Return a list of the indices of a cell's neighbors.
+
+        Only neighbors inside the grid are included, unless the grid wraps
+        around. If `diagonal` is false, only the four orthogonal neighbors are
+        considered, otherwise all eight.
+        """
+
+        width = self.width
+        height = self.height
+        y, x = divmod(index, width)
+        indices = []
+        for step_x, step_y in ALL_STEPS if diagonal else ORTHOGONAL_STEPS:
+            other_x = x + step_x
+            other_y = y + step_y
+            if self.wrap:
+                other_x %= width
+                other_y %= height
+            elif not (0 <= other_x < width and 0 <= other_y < height):
+                continue
+            indices.append(other_y * width + other_x)
+        return indices
+
+    def row(self, y):
+        """Return a copy of a row's cells as a bytearray."""
+
+        start = y * self.width
+        return self.cells[start : start + self.width]
+
+    def count(self):
+        """Return the number of cells with a nonzero value."""
+        return len(self.cells) - self.cells.count(0)
+
+    def to_set(self):
+        """Return a set of the points whose cells have a nonzero value."""
+
+        return {
+            self.point(index)
+            for index, value in enumerate(self.cells)
+            if value
+        }
+
+    def to_dict(self):
+        """Return a dictionary mapping every point to its cell's value."""
+
+        return {
+            self.point(index): value for index, value in enumerate(self.cells)
+        }
+
+    @classmethod
+    def from_points(cls, points, size, value=1, *, wrap=False):
+        """Return a new grid where the given points have the given value.
+
+        All other cells are 0. `size` is a pair (width, height).
+        """
+
+        width, height = size
+        grid = cls(width, height, wrap=wrap)
+        for point in points:
+            grid[point] = value
+        return grid
+
+    @classmethod
+    def from_dict(cls, mapping, size, *, wrap=False):
+        """Return a new grid with values taken from a mapping of points.
+
+        Points missing from `mapping` are 0. `size` is a pair (width, height).
+        """
+
+        width, height = size
+        grid = cls(width, height, wrap=wrap)
+        for point, value in mapping.items():
+            grid[point] = value
+        return grid
+
+    @classmethod
+    def select(cls, target, lines, *, wrap=False):
+        """Return a new grid marking the points with the target character.
+
+        Marked points get the value 1, all others 0. `lines` can be either a
+        string or an iterable of strings, consisting of ASCII characters. The
+        grid is as wide as the longest line.
+
+        This is the dense counterpart of the function select(). Each line is
+        converted with a single translation, without a Python-level loop.
+        """
+
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        else:
+            lines = list(lines)
+        width = max((len(line) for line in lines), default=0)
+        grid = cls(width, len(lines), wrap=wrap)
+        table = bytes(int(byte == ord(target)) for byte in range(256))
+        for y, line in enumerate(lines):
+            start = y * width
+            row = line.encode("ascii").translate(table)
+            grid.cells[start : start + len(row)] = row
+        return grid
+
+
+TILE_SIZE = 32
+
+
+class SparseGrid:
+    """An unbounded grid of small integers, stored in square tiles.
+
+    A SparseGrid works like a dictionary mapping 2D integral points to integers
+    from 0 to 254, except that items can't be deleted. Internally, the plane is
+    divided into tiles of TILE_SIZE by TILE_SIZE cells. A tile is a bytearray
+    that is allocated when one of its cells is first assigned, and the tiles
+    are kept in the dictionary `tiles`, keyed by tile coordinates.
+
+    The number of assigned cells and their bounding box are updated on every
+    assignment, so len() and the `bounds` attribute don't need to look at the
+    cells. `bounds` is None for an empty grid, and otherwise a pair of points:
+    the top-left and bottom-right corners of the bounding box, inclusive.
+    """
+
+    _UNSET = 255
+
+    def __init__(self, items=()):
+        self.tiles = {}
+        self.bounds = None
+        self._count = 0
+        if isinstance(items, dict):
+            items = items.items()
+        for point, value in items:
+            self[point] = value
+
+    def __repr__(self):
+        return f"SparseGrid({dict(self.items())!r})"
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, point):
+        return self.get(point) is not None
+
+    def __iter__(self):
+        for point, _ in self.items():
+            yield point
+
+    def __getitem__(self, point):
+        value = self.get(point)
+        if value is None:
+            raise KeyError(point)
+        return value
+
+    def __setitem__(self, point, value):
+        if not 0 <= value < self._UNSET:
+            raise ValueError(f"SparseGrid value out of range: {value}")
+        x, y = point
+        tile_x, cell_x = divmod(x, TILE_SIZE)
+        tile_y, cell_y = divmod(y, TILE_SIZE)
+        tile = self.tiles.get((tile_x, tile_y))
+        if tile is None:
+            tile = bytearray([self._UNSET]) * (TILE_SIZE * TILE_SIZE)
+            self.tiles[tile_x, tile_y] = tile
+        index = cell_y * TILE_SIZE + cell_x
+        if tile[index] == self._UNSET:
+            self._count += 1
+            if self.bounds is None:
+                self.bounds = Vector2D(x, y), Vector2D(x, y)
+            else:
+                (min_x, min_y), (max_x, max_y) = self.bounds
+                if not (min_x <= x <= max_x and min_y <= y <= max_y):
+                    self.bounds = (
+                        Vector2D(min(min_x, x), min(min_y, y)),
+                        Vector2D(max(max_x, x), max(max_y, y)),
+                    )
+        tile[index] = value
+
+    def get(self, point, default=None):
+        """Return the value at `point`, or `default` if it isn't assigned."""
+
+        x, y = point
+        tile_x, cell_x = divmod(x, TILE_SIZE)
+        tile_y, cell_y = divmod(y, TILE_SIZE)
+        tile = self.tiles.get((tile_x, tile_y))
+        if tile is None:
+            return default
+        value = tile[cell_y * TILE_SIZE + cell_x]
+        return default if value == self._UNSET else value
+
+    def items(self):
+        """Return an iterator over (point, value) pairs, tile by tile."""
+
+        for (tile_x, tile_y), tile in self.tiles.items():
+            for index, value in enumerate(tile):
+                if value != self._UNSET:
+                    cell_y, cell_x = divmod(index, TILE_SIZE)
+                    x = tile_x * TILE_SIZE + cell_x
+                    y = tile_y * TILE_SIZE + cell_y
+                    yield Vector2D(x, y), value
+
+
+def neighbor_table(grid, *, diagonal=True):
+    """Return a table listing the neighbors of each cell of a Grid instance.
+
+    The return value is a helpers.IntTable whose row i holds the indices of the
+    neighbors of the cell with index i. Only cells with a nonzero value count:
+    the other cells have no neighbors and aren't anyone's neighbor. Neighbors
+    are determined as in Grid.neighbor_indices(), so they wrap around the edges
+    if the grid does. The table is built once and stored in two flat arrays.
+    """
+
+    cells = grid.cells
+    return helpers.IntTable(
+        [
+            other
+            for other in grid.neighbor_indices(index, diagonal=diagonal)
+            if cells[other]
+        ]
+        if value
+        else []
+        for index, value in enumerate(cells)
+    )
+
+
+def sight_table(grid):
+    """Return a table listing the cells visible from each cell of a Grid.
+
+    Only cells with a nonzero value count, like in neighbor_table(). From each
+    such cell, the nearest other one in each of the eight directions is
+    visible, if there is one. The return value is a helpers.IntTable whose row
+    i holds the indices of the cells visible from the cell with index i. The
+    grid's edges are never wrapped around.
+
+    Every row, column, and diagonal is scanned once, linking each nonzero cell
+    to the previous one on the same line, so the running time is proportional
+    to the grid's area.
+    """
+
+    cells = grid.cells
+    indices = range(len(cells))
+    # For each index, the number of nonzero cells before it, which is also the
+    # number of the cell itself if it's nonzero. The last item is the total.
+    numbers = array.array("q", [0])
+    numbers.extend(itertools.accumulate(map(bool, cells)))
+    # For each direction, the nearest nonzero cell by number, or -1.
+    nearest = [array.array("q", [-1]) * numbers[-1] for _ in range(8)]
+    for direction, step in enumerate(((1, 0), (0, 1), (1, 1), (-1, 1))):
+        before = nearest[2 * direction]
+        after = nearest[2 * direction + 1]
+        for line in _grid_lines(grid.width, grid.height, step):
+            marks = cells[line]
+            line_indices = list(itertools.compress(indices[line], marks))
+            line_numbers = list(itertools.compress(numbers[line], marks))
+            for number, previous in zip(line_numbers[1:], line_indices):
+                before[number] = previous
+            for number, index in zip(line_numbers, line_indices[1:]):
+                after[number] = index
+    values = array.array(
+        "q", (index for row in zip(*nearest) for index in row if index != -1)
+    )
+    row_ends = array.array("q", [0])
+    row_ends.extend(
+        itertools.accumulate(8 - row.count(-1) for row in zip(*nearest))
+    )
+    offsets = array.array("q", map(row_ends.__getitem__, numbers))
+    return helpers.IntTable.from_arrays(values, offsets)
+
+
+def settle(cells, neighbors, rule):
+    """Run a cellular automaton until it stops changing and return its state.
+
+    `cells` is an iterable of the indices of the cells taking part, all of
+    which start out dead. `neighbors` maps each cell index to the indices of
+    its neighbors, like a table returned by neighbor_table(). The neighbor
+    relation must be symmetric. `rule(alive, count)` returns whether a cell is
+    alive in the next generation, given whether it's alive now and how many of
+    its neighbors are. All cells are updated simultaneously.
+
+    The return value is a bytearray with one item per index of `neighbors`,
+    which is 1 for live cells and 0 otherwise.
+
+    Instead of re-evaluating every cell in every generation, the number of live
+    neighbors is kept for each cell and updated when a neighbor changes. Only
+    cells that changed or have a neighbor that changed are evaluated again.
+    """
+
+    size = len(neighbors)
+    alive = bytearray(size)
+    counts = [0] * size
+    member = bytearray(size)
+    for cell in cells:
+        member[cell] = 1
+    candidates = [cell for cell in range(size) if member[cell]]
+
+    while True:
+        changed = [
+            cell
+            for cell in candidates
+            if bool(rule(bool(alive[cell]), counts[cell])) != alive[cell]
+        ]
+        if not changed:
+            return alive
+
+        next_candidates = set(changed)
+        for cell in changed:
+            delta = -1 if alive[cell] else 1
+            alive[cell] ^= 1
+            for other in neighbors[cell]:
+                counts[other] += delta
+                if member[other]:
+                    next_candidates.add(other)
+        candidates = next_candidates
+
 
 def select(target, lines):
     """Return a set of the points marked with the target character.
@@ -218,35 +592,127 @@ def select_and_measure(target, lines):
     return select(target, lines), Vector2D(width, height)
 
 
+def render(grid, symbols):
+    """Return a visual representation of a grid as a string.
+
+    The string consists of lines, each ending with a newline character. See
+    show() for the meaning of the arguments and the format of the lines.
+    """
+
+    if isinstance(grid, Grid):
+        lines = _dense_lines(grid, symbols)
+    elif isinstance(grid, SparseGrid) and _fits_byte_table(symbols):
+        lines = _tile_lines(grid, symbols)
+    else:
+        lines = _mapping_lines(grid, symbols)
+    return "".join(line + "\n" for line in lines)
+
+
 def show(grid, symbols):
     """Print a visual representation of a grid.
 
     `grid` is a mapping from 2D integral points (tuples or Vector2D instances)
-    to values of any type. `symbols` is a mapping from values to characters
-    visualizing these values.
+    to values of any type, or a Grid or SparseGrid instance. `symbols` is a
+    mapping from values to characters visualizing these values.
 
     Values not present in `symbols` are shown as spaces, or not depicted at all
     if they're out of frame. Points not present in the grid are treated as if
     they had the value None. Neighboring points within each row are separated
-    by spaces.
+    by spaces. A Grid instance is shown in full, while for other grids, the
+    frame is the bounding box of the points with a value in `symbols`.
 
     For example, show({(0, 0): 7, (1, 0): 8, (1, 1): 8}, {7: '>', 8: '|'})
     prints the following to stdout:
 
         > |
           |
+
+    Whenever all symbols are ASCII characters, rows are built by translating
+    whole rows of a byte buffer. The output is written with a single call.
     """
 
-    visible = [point for point, value in grid.items() if value in symbols]
-    if not visible:
-        return
-    visible_x = {x for x, _ in visible}
-    visible_y = {y for _, y in visible}
-    x_range = range(min(visible_x), max(visible_x) + 1)
-    y_range = range(min(visible_y), max(visible_y) + 1)
-    for y in y_range:
-        row = (grid.get((x, y)) for x in x_range)
-        print(" ".join(symbols.get(value, " ") for value in row))
+    sys.stdout.write(render(grid, symbols))
+
+
+def write_pbm(grid, file):
+    """Write a Grid instance to a binary file as a PBM image.
+
+    Nonzero cells are black, and zero cells are white. `file` must be opened in
+    binary mode. The image is written in the raw ("P4") format, with a single
+    call to file.write().
+    """
+
+    width = grid.width
+    padded_width = -(-width // 8) * 8
+    bits = b"0" + b"1" * 255
+    rows = [f"P4\n{width} {grid.height}\n".encode("ascii")]
+    for y in range(grid.height):
+        row = grid.row(y).translate(bits).ljust(padded_width, b"0")
+        rows.append(int(b"0" + row, 2).to_bytes(padded_width // 8, "big"))
+    file.write(b"".join(rows))
+
+
+def write_pgm(grid, file, max_value=255):
+    """Write a Grid instance to a binary file as a PGM image.
+
+    Each cell's value is the gray level of its pixel, from 0 (black) to
+    `max_value` (white). `file` must be opened in binary mode. The image is
+    written in the raw ("P5") format, with a single call to file.write().
+    """
+
+    header = f"P5\n{grid.width} {grid.height}\n{max_value}\n"
+    file.write(header.encode("ascii") + grid.cells)
+
+
+def spiral_point(square_id):
+    """Return the point of a square in a spiral, given its ID.
+
+    The spiral starts with ID 1 at the origin, continues with ID 2 to the
+    right of it, and winds counterclockwise, with the Y-axis pointing down:
+
+        5   4   3
+        6   1   2
+        7   8   9  10
+
+    The point is computed in constant time, without walking the spiral.
+    """
+
+    if square_id < 1:
+        raise ValueError(f"invalid square ID: {square_id}")
+    if square_id == 1:
+        return ORIGIN_2D
+    # Ring k holds the IDs from (2k-1)**2 + 1 to (2k+1)**2, in four sides of
+    # length 2k, starting just above the bottom-right corner.
+    ring = (_isqrt(square_id - 1) + 1) // 2
+    side, offset = divmod(square_id - (2 * ring - 1) ** 2 - 1, 2 * ring)
+    if side == 0:
+        return Vector2D(ring, ring - 1 - offset)
+    if side == 1:
+        return Vector2D(ring - 1 - offset, -ring)
+    if side == 2:
+        return Vector2D(-ring, -ring + 1 + offset)
+    return Vector2D(-ring + 1 + offset, ring)
+
+
+def spiral_id(point):
+    """Return the ID of the square at an integral point in a spiral.
+
+    This is the inverse of spiral_point(), and it also runs in constant time.
+    """
+
+    x, y = point
+    ring = max(abs(x), abs(y))
+    if ring == 0:
+        return 1
+    if x == ring and y < ring:
+        side, offset = 0, ring - 1 - y
+    elif y == -ring:
+        side, offset = 1, ring - 1 - x
+    elif x == -ring:
+        side, offset = 2, y + ring - 1
+    else:
+        side, offset = 3, x + ring - 1
+    return (2 * ring - 1) ** 2 + 1 + side * 2 * ring + offset
 
 
 def move_left(point):
@@ -289,3 +755,167 @@ def move_down(point):
 
     x, y = point
     return x, y + 1
+
+
+def _fits_byte_table(symbols):
+    """Return True if `symbols` maps byte values to ASCII characters only."""
+
+    return all(
+        isinstance(value, int) and 0 <= value < 256 and _is_ascii_char(symbol)
+        for value, symbol in symbols.items()
+    )
+
+
+def _is_ascii_char(symbol):
+    """Return True if `symbol` is a single ASCII character."""
+    return isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 128
+
+
+def _symbol_table(symbols, blank=" "):
+    """Return a translation table from byte values to symbol bytes."""
+
+    table = bytearray(ord(blank) for _ in range(256))
+    for value, symbol in symbols.items():
+        table[value] = ord(symbol)
+    return table
+
+
+def _dense_lines(grid, symbols):
+    """Return an iterator over the lines of text that show a Grid."""
+
+    if _fits_byte_table(symbols):
+        table = _symbol_table(symbols)
+        for y in range(grid.height):
+            yield " ".join(grid.row(y).translate(table).decode("ascii"))
+    else:
+        for y in range(grid.height):
+            yield " ".join(symbols.get(value, " ") for value in grid.row(y))
+
+
+def _tile_lines(grid, symbols):
+    """Return an iterator over the lines of text that show a SparseGrid."""
+
+    # The bounding box of the visible cells is found with a few operations per
+    # row of each tile, rather than per cell.
+    is_visible = bytearray(256)
+    for value in symbols:
+        is_visible[value] = 1
+    is_visible[SparseGrid._UNSET] = 0
+    min_x = min_y = max_x = max_y = None
+    for (tile_x, tile_y), tile in grid.tiles.items():
+        mask = tile.translate(is_visible)
+        if 1 not in mask:
+            continue
+        for cell_y in range(TILE_SIZE):
+            row_mask = mask[cell_y * TILE_SIZE : (cell_y + 1) * TILE_SIZE]
+            first = row_mask.find(1)
+            if first == -1:
+                continue
+            x = tile_x * TILE_SIZE
+            y = tile_y * TILE_SIZE + cell_y
+            left = x + first
+            right = x + row_mask.rfind(1)
+            if min_x is None:
+                min_x, min_y, max_x, max_y = left, y, right, y
+            else:
+                min_x = min(min_x, left)
+                min_y = min(min_y, y)
+                max_x = max(max_x, right)
+                max_y = max(max_y, y)
+    if min_x is None:
+        return
+
+    table = _symbol_table(symbols)
+    table[SparseGrid._UNSET] = ord(" ")
+    blank = bytes([SparseGrid._UNSET]) * TILE_SIZE
+    first_tile_x = min_x // TILE_SIZE
+    tile_x_range = range(first_tile_x, max_x // TILE_SIZE + 1)
+    start = min_x - first_tile_x * TILE_SIZE
+    stop = start + max_x - min_x + 1
+    for y in range(min_y, max_y + 1):
+        tile_y, cell_y = divmod(y, TILE_SIZE)
+        row_start = cell_y * TILE_SIZE
+        parts = []
+        for tile_x in tile_x_range:
+            tile = grid.tiles.get((tile_x, tile_y))
+            if tile is None:
+                parts.append(blank)
+            else:
+                parts.append(tile[row_start : row_start + TILE_SIZE])
+        row = b"".join(parts)[start:stop].translate(table)
+        yield " ".join(row.decode("ascii"))
+
+
+def _mapping_lines(grid, symbols):
+    """Return an iterator over the lines of text that show a mapping."""
+
+    visible = [point for point, value in grid.items() if value in symbols]
+    if not visible:
+        return
+    visible_x = {x for x, _ in visible}
+    visible_y = {y for _, y in visible}
+    x_range = range(min(visible_x), max(visible_x) + 1)
+    y_range = range(min(visible_y), max(visible_y) + 1)
+
+    blank = symbols.get(None, " ")
+    all_symbols = [blank, *symbols.values()]
+    if not all(_is_ascii_char(symbol) for symbol in all_symbols):
+        for y in y_range:
+            row = (grid.get((x, y)) for x in x_range)
+            yield " ".join(symbols.get(value, " ") for value in row)
+        return
+
+    # Paint the symbols into a buffer covering the frame, one byte per point.
+    width = len(x_range)
+    buffer = bytearray(blank.encode("ascii")) * (width * len(y_range))
+    for (x, y), value in grid.items():
+        if x in x_range and y in y_range:
+            index = (y - y_range.start) * width + x - x_range.start
+            buffer[index] = ord(symbols.get(value, " "))
+    for start in range(0, len(buffer), width):
+        yield " ".join(buffer[start : start + width].decode("ascii"))
+
+
+def _isqrt(n):
+    """Return the largest integer whose square is at most `n`."""
+
+    if n < 0:
+        raise ValueError("square root not defined for negative numbers")
+    if n == 0:
+        return 0
+    # Newton's method, starting from a power of 2 that's at least the root.
+    x = 1 << -(-n.bit_length() // 2)
+    while True:
+        y = (x + n // x) // 2
+        if y >= x:
+            return x
+        x = y
+
+
+def _grid_lines(width, height, step):
+    """Yield a slice of cell indices for each line through a grid.
+
+    The lines run in direction `step`, which must be (1, 0), (0, 1), (1, 1),
+    or (-1, 1), from one edge of the grid to another. Lines with fewer than two
+    cells are skipped.
+    """
+
+    step_x, step_y = step
+    if step_y == 0:
+        starts = [(0, y) for y in range(height)]
+    else:
+        starts = [(x, 0) for x in range(width)]
+        if step_x == 1:
+            starts += [(0, y) for y in range(1, height)]
+        elif step_x == -1:
+            starts += [(width - 1, y) for y in range(1, height)]
+    offset = step_y * width + step_x
+    for x, y in starts:
+        length = height - y if step_y else width
+        if step_x == 1:
+            length = min(length, width - x)
+        elif step_x == -1:
+            length = min(length, x + 1)
+        if length >= 2:
+            start = y * width + x
+            yield slice(start, start + offset * length, offset)
@@ -1,7 +1,20 @@
 """Santa's little helpers: general-purpose helper tools."""
 
+import array
 import collections
+import functools
 import itertools
+import operator
+import string
+
+
+# A table mapping each byte value to the bit for its letter, or to 0.
+_LETTER_BITS = [
+    1 << string.ascii_letters.index(char) % 26
+    if char in string.ascii_letters
+    else 0
+    for char in map(chr, range(256))
+]
 
 
 def chunked(iterable, length):
@@ -42,6 +55,116 @@ def grouped(pairs):
     return groups
 
 
+class IntTable:
+    """A table of integers, with rows of any length.
+
+    All values are stored in a single flat array with the type code 'q',
+    available as the attribute `values`. The attribute `offsets` is an array
+    holding the index in `values` where each row starts, followed by the total
+    number of values. Every value must fit into a signed 64-bit integer, or an
+    OverflowError is raised. This layout suits large tables such as adjacency
+    lists, which would otherwise need one list object per row.
+
+    The length of an IntTable is its number of rows. Indexing and iterating
+    produce memoryview objects, one per row, which support len(), indexing,
+    iteration, min(), max(), and sum(). These views don't compare equal to
+    lists; use their tolist() method, or the table's tolist() method, to get
+    lists. Rows can't be added or resized after the table is created.
+
+    Example: IntTable([[1, 2], [], [3]]).row_sums() --> [3, 0, 3]
+    """
+
+    def __init__(self, rows=()):
+        values = array.array("q")
+        offsets = array.array("q", [0])
+        for row in rows:
+            values.extend(row)
+            offsets.append(len(values))
+        self.values = values
+        self.offsets = offsets
+        self._view = memoryview(values)
+
+    @classmethod
+    def from_arrays(cls, values, offsets):
+        """Return a table using the given arrays as `values` and `offsets`.
+
+        Both must be arrays with the type code 'q', laid out as described
+        above. They aren't copied.
+        """
+
+        table = cls()
+        table.values = values
+        table.offsets = offsets
+        table._view = memoryview(values)
+        return table
+
+    def __repr__(self):
+        return f"IntTable({self.tolist()!r})"
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """Return a view of the row with the given index."""
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("IntTable index out of range")
+        return self._view[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self):
+        view = self._view
+        offsets = self.offsets
+        for start, stop in zip(offsets, offsets[1:]):
+            yield view[start:stop]
+
+    def row_mins(self):
+        """Return a list of the smallest value in each row."""
+        return [min(row) for row in self]
+
+    def row_maxes(self):
+        """Return a list of the largest value in each row."""
+        return [max(row) for row in self]
+
+    def row_sums(self):
+        """Return a list of the sum of each row."""
+        return [sum(row) for row in self]
+
+    def tolist(self):
+        """Return the table as a list of lists of integers."""
+        return [row.tolist() for row in self]
+
+
+def k_sum(values, k, target):
+    """Return a tuple of `k` items of `values` that add up to `target`.
+
+    The items must come from different positions in `values`, but they may be
+    equal. Return None if there's no such combination.
+
+    For k=2, a set of the items seen so far is used, which takes linear time.
+    For larger k, the items are sorted, the smallest item of the combination is
+    chosen by trying each candidate in turn, and the last two items are found
+    by moving two pointers inward. Candidates are skipped if even the smallest
+    or largest remaining items can't reach `target`.
+
+    Example: k_sum([1721, 979, 366, 299, 675, 1456], 2, 2020) --> (1721, 299)
+    """
+
+    if k < 0:
+        raise ValueError("k for k_sum() must not be negative")
+    if k <= 2:
+        seen = set()
+        for value in values:
+            if k == 1 and value == target:
+                return (value,)
+            if k == 2 and target - value in seen:
+                return target - value, value
+            seen.add(value)
+        return () if k == 0 and target == 0 else None
+    return _sorted_k_sum(sorted(values), 0, k, target)
+
+
 def last(iterable):
     """Return the last item of an iterable.
 
@@ -54,6 +177,34 @@ def last(iterable):
     return tail[0]
 
 
+def letter_mask(text):
+    """Return a 26-bit integer with one bit set for each letter in `text`.
+
+    Bit 0 stands for 'a' or 'A', bit 1 for 'b' or 'B', and so on. Other
+    characters are ignored. `text` can be a string or a bytes-like object. The
+    masks of several texts can be combined with | for a union and & for an
+    intersection, and popcount() counts the letters in a mask.
+
+    Example: letter_mask('abz') --> 0b10000000000000000000000011
+    """
+
+    if isinstance(text, str):
+        text = text.encode("ascii", "ignore")
+    bits = map(_LETTER_BITS.__getitem__, text)
+    return functools.reduce(operator.or_, bits, 0)
+
+
+def popcount(n):
+    """Return the number of one bits in a non-negative integer.
+
+    Example: popcount(0b1011) --> 3
+    """
+
+    if n < 0:
+        raise ValueError("popcount() argument must not be negative")
+    return bin(n).count("1")
+
+
 def product(iterable):
     """Return the product of an iterable's items.
 
@@ -83,3 +234,38 @@ def transpose(matrix):
     """
 
     return list(itertools.zip_longest(*matrix))
+
+
+def _sorted_k_sum(values, start, k, target):
+    """Return k items of values[start:] that add up to `target`.
+
+    `values` must be sorted, and `k` must be at least 2. Return None if
+    there's no such combination.
+    """
+
+    if k == 2:
+        low = start
+        high = len(values) - 1
+        while low < high:
+            pair_sum = values[low] + values[high]
+            if pair_sum == target:
+                return values[low], values[high]
+            if pair_sum < target:
+                low += 1
+            else:
+                high -= 1
+        return None
+
+    largest_rest = sum(values[len(values) - k + 1 :])
+    for i in range(start, len(values) - k + 1):
+        value = values[i]
+        if i > start and value == values[i - 1]:
+            continue
+        if sum(values[i : i + k]) > target:
+            break
+        if value + largest_rest < target:
+            continue
+        rest = _sorted_k_sum(values, i + 1, k - 1, target - value)
+        if rest is not None:
+            return (value, *rest)
+    return None
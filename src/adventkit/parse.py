@@ -1,7 +1,28 @@
 """Tools for parsing puzzle input."""
 
+import array
 import re
 
+from adventkit import helpers
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _compiled(pattern):
+    """Return a pair of compiled regexes, for strings and for bytes."""
+
+    bytes_pattern = pattern.encode("ascii")
+    return re.compile(pattern, re.ASCII), re.compile(bytes_pattern, re.ASCII)
+
+
+_INT_REGEXES = _compiled(r"(?<!\d)-?\d+")
+_STRING_REGEXES = _compiled(r"[A-Za-z\d]+")
+_MIXED_REGEXES = _compiled(r"(?:(?<![A-Za-z\d])-)?(\d+)|[A-Za-z]+")
+_LINE_REGEXES = _compiled(r"(?!\Z)([^\r\n]*)(?:\r\n|\r|\n|\Z)")
+
 
 def ints(text):
     """Return a list of extracted integers.
@@ -10,11 +31,50 @@ def ints(text):
     minus sign, unless it directly follows another number, in which case it's
     treated as a separator.
 
+    `text` can be a string or a bytes-like object such as `bytes` or
+    `mmap.mmap`. Bytes are searched directly, without decoding them first.
+
     Example: ints('-3 T-4,5-10') --> [-3, -4, 5, 10]
     """
 
-    pattern = r"(?<!\d)-?\d+"
-    return [int(match) for match in re.findall(pattern, text, re.ASCII)]
+    regex = _regex(_INT_REGEXES, text)
+    return list(map(int, regex.findall(text)))
+
+
+def int_array(text):
+    """Return the extracted integers in a compact array.
+
+    The return value is an `array.array` with the type code 'q', which stores
+    each integer in 8 bytes instead of as a separate object. If an integer is
+    too large for that, a list is returned instead, just like from ints().
+
+    `text` can be a string or a bytes-like object, as in ints().
+    """
+
+    # The array is filled while scanning, without a list of all the tokens.
+    # If a value doesn't fit, the text is scanned again into a list.
+    regex = _regex(_INT_REGEXES, text)
+    try:
+        values = (int(match[0]) for match in regex.finditer(text))
+        return array.array("q", values)
+    except OverflowError:
+        return ints(text)
+
+
+def int_ndarray(text):
+    """Return the extracted integers in a one-dimensional NumPy array.
+
+    The array has the dtype int64, unless an integer is too large for that, in
+    which case the dtype is object. Raise an ImportError if NumPy isn't
+    installed.
+    """
+
+    if numpy is None:
+        raise ImportError("int_ndarray() requires NumPy")
+    values = int_array(text)
+    if isinstance(values, array.array):
+        return numpy.frombuffer(values, dtype=numpy.int64)
+    return numpy.array(values, dtype=object)
 
 
 def strings(text):
@@ -23,7 +83,7 @@ def strings(text):
     Example: strings('53_7A,a735') --> ['53', '7A', 'a735']
     """
 
-    return re.findall(r"[A-Za-z\d]+", text, re.ASCII)
+    return _STRING_REGEXES[0].findall(text)
 
 
 def mixed_values(text):
@@ -36,22 +96,30 @@ def mixed_values(text):
     Example: mixed_values('-1-99 A7: Q-8,-9') --> [-1, 99, 'A', 7, 'Q', 8, -9]
     """
 
-    pattern = r"(?:(?<![A-Za-z\d])-)?\d+|[A-Za-z]+"
     return [
-        int(match) if match[0] in "0123456789-" else match
-        for match in re.findall(pattern, text, re.ASCII)
+        int(match[0]) if match[1] is not None else match[0]
+        for match in _MIXED_REGEXES[0].finditer(text)
     ]
 
 
-def int_rows(text, *, row_sep=None):
+def int_rows(text, *, row_sep=None, compact=False):
     """Parse a table and return a list of lists of extracted integers.
 
     `row_sep` is a string that separates rows in `text`. If `row_sep` is None,
     each line in `text` represents a row.
 
+    If `compact` is true, return a helpers.IntTable instead, which stores the
+    values more compactly. If an integer is too large for an IntTable, a list
+    of lists is returned anyway.
+
     See ints() for details on the handling of hyphen-minus characters.
     """
 
+    if compact:
+        try:
+            return helpers.IntTable(iter_int_rows(text, row_sep=row_sep))
+        except OverflowError:
+            pass
     raw_rows = _split(text, row_sep)
     return [ints(row) for row in raw_rows]
 
@@ -102,9 +170,180 @@ def mixed_tables(text, *, table_sep=None, row_sep=None):
     return [mixed_rows(line, row_sep=row_sep) for line in raw_tables]
 
 
+def iter_ints(text):
+    """Return an iterator over extracted integers.
+
+    This is the lazy counterpart of ints(). `text` can be a string or a
+    bytes-like object such as `bytes` or `mmap.mmap`.
+
+    Example: iter_ints(b'-3 T-4,5-10') --> -3, -4, 5, 10
+    """
+
+    for match in _regex(_INT_REGEXES, text).finditer(text):
+        yield int(match[0])
+
+
+def iter_strings(text):
+    """Return an iterator over extracted alphanumeric strings.
+
+    This is the lazy counterpart of strings(). `text` can be a string or a
+    bytes-like object, in which case the extracted values are decoded to
+    strings.
+    """
+
+    for match in _regex(_STRING_REGEXES, text).finditer(text):
+        yield _decoded(match[0])
+
+
+def iter_mixed_values(text):
+    """Return an iterator over extracted integers and alphabetic strings.
+
+    This is the lazy counterpart of mixed_values(). `text` can be a string or
+    a bytes-like object, in which case the strings are decoded.
+    """
+
+    for match in _regex(_MIXED_REGEXES, text).finditer(text):
+        if match[1] is not None:
+            yield int(match[0])
+        else:
+            yield _decoded(match[0])
+
+
+def iter_int_rows(text, *, row_sep=None):
+    """Return an iterator over lists of integers, one list per table row.
+
+    This is the lazy counterpart of int_rows(), and `row_sep` has the same
+    meaning. Only one row is held in memory at a time.
+    """
+
+    for row in _iter_split(text, row_sep):
+        yield list(iter_ints(row))
+
+
+def iter_string_rows(text, *, row_sep=None):
+    """Return an iterator over lists of alphanumeric strings, one per row.
+
+    This is the lazy counterpart of string_rows().
+    """
+
+    for row in _iter_split(text, row_sep):
+        yield list(iter_strings(row))
+
+
+def iter_mixed_rows(text, *, row_sep=None):
+    """Return an iterator over lists of integers and strings, one per row.
+
+    This is the lazy counterpart of mixed_rows().
+    """
+
+    for row in _iter_split(text, row_sep):
+        yield list(iter_mixed_values(row))
+
+
+def iter_mixed_tables(text, *, table_sep=None, row_sep=None):
+    """Return an iterator over tables of parsed values.
+
+    This is the lazy counterpart of mixed_tables(). Each table is a list of
+    lists, just like the items of the list returned by mixed_tables().
+    """
+
+    if table_sep is None and row_sep is None:
+        raise ValueError("iter_mixed_tables() needs table_sep or row_sep")
+
+    for table in _iter_split(text, table_sep):
+        yield list(iter_mixed_rows(table, row_sep=row_sep))
+
+
+def row_parser(schema):
+    r"""Return a function that parses table rows according to a schema.
+
+    `schema` describes the layout of every row. Each occurrence of the word
+    'int' in it stands for an integer with an optional sign, and each
+    occurrence of the word 'str' stands for an alphabetic string. Words that
+    merely contain 'int' or 'str', such as 'print', match themselves.
+    Whitespace in `schema` matches one or more whitespace characters, and other
+    characters match themselves. The regular expression for the schema is
+    compiled only once.
+
+    The returned function takes a string or bytes-like object and an optional
+    keyword argument `row_sep`, which has the same meaning as in int_rows(). It
+    returns an iterator over tuples of values, one tuple per row. A ValueError
+    is raised when reaching a row that doesn't match the schema.
+
+    Example: row_parser('int-int str: str')('1-3 a: abc\n2-9 c: ccc')
+    --> (1, 3, 'a', 'abc'), (2, 9, 'c', 'ccc')
+    """
+
+    parts = [r"\s*"]
+    converters = []
+    for i, token in enumerate(re.split(r"\b(int|str)\b", schema)):
+        if i % 2 == 0:
+            for j, literal in enumerate(re.split(r"(\s+)", token)):
+                parts.append(r"\s+" if j % 2 else re.escape(literal))
+        elif token == "int":
+            parts.append(r"([-+]?\d+)")
+            converters.append(int)
+        else:
+            parts.append(r"([A-Za-z]+)")
+            converters.append(_decoded)
+    parts.append(r"\s*")
+    regexes = _compiled("".join(parts))
+
+    def parse_rows(text, *, row_sep=None):
+        regex = _regex(regexes, text)
+        for row in _iter_split(text, row_sep):
+            match = regex.fullmatch(row)
+            if match is None:
+                raise ValueError(f"row doesn't match {schema!r}: {row!r}")
+            values = zip(converters, match.groups())
+            yield tuple(convert(value) for convert, value in values)
+
+    return parse_rows
+
+
 def _split(text, sep=None):
     """Split a string by delimiter or into lines and return a list of parts."""
 
     if sep is None:
         return text.splitlines()
     return text.split(sep)
+
+
+def _iter_split(text, sep=None):
+    """Split a string or bytes-like object lazily and return an iterator.
+
+    If `sep` is None, split into lines at '\n', '\r\n', or '\r'. Like
+    str.splitlines(), this doesn't produce an empty part after a final line
+    break. If `text` isn't a string, a string `sep` is encoded as ASCII.
+    """
+
+    if sep is None:
+        for match in _regex(_LINE_REGEXES, text).finditer(text):
+            yield match[1]
+        return
+
+    if not isinstance(text, str) and isinstance(sep, str):
+        sep = sep.encode("ascii")
+    start = 0
+    while True:
+        end = text.find(sep, start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + len(sep)
+
+
+def _regex(regexes, text):
+    """Return the regex out of a pair from _compiled() that fits `text`."""
+
+    str_regex, bytes_regex = regexes
+    return str_regex if isinstance(text, str) else bytes_regex
+
+
+def _decoded(value):
+    """Return `value` as a string, decoding it as ASCII if necessary."""
+
+    if isinstance(value, str):
+        return value
+    return value.decode("ascii")
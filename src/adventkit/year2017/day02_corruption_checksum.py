@@ -1,17 +1,50 @@
+import array
 import itertools
 
-from adventkit import parse
+from adventkit import helpers, parse
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 def solve(data):
-    rows = parse.int_rows(data)
-    checksum = sum(max(row) - min(row) for row in rows)
-    print(checksum)
+    rows = parse.int_rows(data, compact=True)
+    print(checksum(rows))
     print(sum(quotient(row) for row in rows))
 
 
+def checksum(rows):
+    # NumPy is only used for an IntTable whose rows all have the same nonzero
+    # length, which is read off the row offsets.
+    if isinstance(rows, helpers.IntTable):
+        width = _row_width(rows)
+    else:
+        width = None
+    if numpy is None or width is None:
+        return sum(max(row) - min(row) for row in rows)
+    matrix = numpy.frombuffer(rows.values, dtype=numpy.int64)
+    matrix = matrix.reshape(len(rows), width)
+    maxes = matrix.max(axis=1).tolist()
+    mins = matrix.min(axis=1).tolist()
+    return sum(high - low for high, low in zip(maxes, mins))
+
+
 def quotient(row):
     for a, b in itertools.permutations(row, 2):
         if b != 0 and a % b == 0:
             return a // b
     raise ValueError("can't evenly divide any two values")
+
+
+def _row_width(table):
+    # Return the length shared by all rows of an IntTable, or None if the
+    # lengths differ or are 0.
+    offsets = table.offsets
+    if len(offsets) < 2 or offsets[1] == 0:
+        return None
+    width = offsets[1]
+    if offsets != array.array("q", range(0, offsets[-1] + 1, width)):
+        return None
+    return width
@@ -3,46 +3,50 @@ import itertools
 from adventkit import grids
 
 
+TURNS = grids.RIGHT, grids.UP, grids.LEFT, grids.DOWN
+
+
 def solve(data):
     number = int(data)
-    square = locate_square(square_id=number)
+    square = grids.spiral_point(number)
     print(square.manhattan_distance(grids.ORIGIN_2D))
     print(first_value_above(threshold=number))
 
 
-def locate_square(square_id):
-    square = grids.ORIGIN_2D
-    steps_left = square_id - 1
-    for step, length in spiral_segments():
-        if steps_left <= length:
-            square += step * steps_left
-            break
-        square += step * length
-        steps_left -= length
-    return square
-
-
 def first_value_above(threshold):
-    memory = {}
-    square = grids.ORIGIN_2D
-    value = 1
-    steps = spiral_steps()
-    while value <= threshold:
-        memory[square] = value
-        square += next(steps)
-        value = sum(memory.get(neighbor, 0) for neighbor in square.neighbors())
-    return value
-
-
-def spiral_segments():
-    step = grids.RIGHT
-    for length in itertools.count(1):
-        for _ in range(2):
-            yield step, length
-            step = step.rotate_left()
-
-
-def spiral_steps():
-    for step, length in spiral_segments():
+    # The values fill a square of the plane that's enlarged until it holds the
+    # answer. The values grow exponentially, so that square stays small.
+    if threshold < 1:
+        return 1
+    radius = 4
+    while True:
+        value = spiral_sums_above(threshold, radius)
+        if value is not None:
+            return value
+        radius *= 2
+
+
+def spiral_sums_above(threshold, radius):
+    # Walk the spiral through a flat list of values covering the points within
+    # `radius` of the origin, moving with precomputed index offsets instead of
+    # points. Unvisited squares hold 0, so each new value is simply the sum of
+    # all neighbors. Return None if the walk reaches the edge first.
+    width = 2 * radius + 1
+    neighbor_offsets = [y * width + x for x, y in grids.ALL_STEPS]
+    turn_offsets = [y * width + x for x, y in TURNS]
+    values = [0] * (width * width)
+    index = radius * width + radius
+    values[index] = 1
+    for side in itertools.count():
+        # The sides have lengths 1, 1, 2, 2, 3, 3 and so on, and a side of
+        # length n reaches up to (n+1) // 2 squares from the origin.
+        length = side // 2 + 1
+        if (length + 1) // 2 >= radius:
+            return None
+        offset = turn_offsets[side % 4]
         for _ in range(length):
-            yield step
+            index += offset
+            value = sum(values[index + other] for other in neighbor_offsets)
+            if value > threshold:
+                return value
+            values[index] = value
@@ -1,10 +1,54 @@
-from adventkit import parse
+from adventkit import helpers, parse
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# With NumPy, the masses are processed in chunks of this many values, so the
+# input is never held in memory all at once.
+CHUNK_SIZE = 4096
 
 
 def solve(data):
-    masses = parse.ints(data)
-    print(sum(fuel_needed(mass) for mass in masses))
-    print(sum(total_fuel(mass) for mass in masses))
+    masses = parse.iter_ints(data)
+    if numpy is None:
+        totals = fuel_sums(masses)
+    else:
+        totals = vectorized_fuel_sums(masses)
+    simple_total, full_total = totals
+    print(simple_total)
+    print(full_total)
+
+
+def fuel_sums(masses):
+    simple_total = 0
+    full_total = 0
+    for mass in masses:
+        simple_total += fuel_needed(mass)
+        full_total += total_fuel(mass)
+    return simple_total, full_total
+
+
+def vectorized_fuel_sums(masses):
+    simple_total = 0
+    full_total = 0
+    for chunk in helpers.chunked(masses, CHUNK_SIZE):
+        try:
+            fuel = fuel_needed(numpy.array(chunk, dtype=numpy.int64))
+        except OverflowError:
+            chunk_simple_total, chunk_full_total = fuel_sums(chunk)
+            simple_total += chunk_simple_total
+            full_total += chunk_full_total
+            continue
+        # The sums are taken with Python integers, which can't overflow.
+        simple_total += int(fuel.sum(dtype=object))
+        while fuel.size:
+            fuel = fuel[fuel > 0]
+            full_total += int(fuel.sum(dtype=object))
+            fuel = fuel_needed(fuel)
+    return simple_total, full_total
 
 
 def fuel_needed(mass):
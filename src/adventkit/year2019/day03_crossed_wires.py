@@ -1,38 +1,113 @@
-from adventkit import grids, parse
+import bisect
+import typing
+
+from adventkit import helpers, parse
+
+
+STEPS = {"L": -1, "R": +1, "U": -1, "D": +1}
+
+
+class Segment(typing.NamedTuple):
+    # A straight part of a wire, visiting the squares from `low` to `high`
+    # (inclusive) along its axis. It begins next to the square at `start`,
+    # which the wire reaches at time `time`.
+    fixed: int
+    low: int
+    high: int
+    start: int
+    time: int
+
+    def delay(self, position):
+        return self.time + abs(position - self.start)
 
 
 def solve(data):
     path_a, path_b = parse.mixed_tables(data, row_sep=",")
-    visits_a = visits(path_a)
-    visits_b = visits(path_b)
-    intersections = {square for square in visits_a if square in visits_b}
+    crossings = list(find_crossings(split(path_a), split(path_b)))
+    print(min(abs(x) + abs(y) for x, y, _ in crossings))
+    print(min(delay for _, _, delay in crossings))
 
-    distances = (
-        grids.ORIGIN_2D.manhattan_distance(square) for square in intersections
-    )
-    print(min(distances))
 
-    delays = (visits_a[square] + visits_b[square] for square in intersections)
-    print(min(delays))
+def split(path):
+    horizontal = []
+    vertical = []
+    x = y = time = 0
+    for direction, num_steps in path:
+        if num_steps == 0:
+            continue
+        step = STEPS[direction]
+        if direction in "LR":
+            end = x + step * num_steps
+            low, high = sorted([x + step, end])
+            horizontal.append(Segment(y, low, high, x, time))
+            x = end
+        else:
+            end = y + step * num_steps
+            low, high = sorted([y + step, end])
+            vertical.append(Segment(x, low, high, y, time))
+            y = end
+        time += num_steps
+    return horizontal, vertical
 
 
-def visits(path):
-    first_visit = {}
-    for time, square in enumerate(squares(path), 1):
-        if square not in first_visit:
-            first_visit[square] = time
-    return first_visit
+def find_crossings(wire_a, wire_b):
+    horizontal_a, vertical_a = wire_a
+    horizontal_b, vertical_b = wire_b
+    for horizontal, vertical in [
+        (horizontal_a, vertical_b),
+        (horizontal_b, vertical_a),
+    ]:
+        pairs = perpendicular_crossings(horizontal, vertical)
+        for segment_h, segment_v in pairs:
+            x = segment_v.fixed
+            y = segment_h.fixed
+            yield x, y, segment_h.delay(x) + segment_v.delay(y)
 
+    overlaps = collinear_crossings(horizontal_a, horizontal_b)
+    for fixed, position, delay in overlaps:
+        yield position, fixed, delay
+    overlaps = collinear_crossings(vertical_a, vertical_b)
+    for fixed, position, delay in overlaps:
+        yield fixed, position, delay
 
-def squares(path):
-    square = 0, 0
-    for direction, num_steps in path:
-        move = {
-            "L": grids.move_left,
-            "R": grids.move_right,
-            "U": grids.move_up,
-            "D": grids.move_down,
-        }[direction]
-        for _ in range(num_steps):
-            square = move(square)
-            yield square
+
+def perpendicular_crossings(horizontal, vertical):
+    # Sweep a vertical line from left to right, keeping the horizontal
+    # segments it currently crosses in a list sorted by Y-value.
+    events = [(segment.low, 0, i) for i, segment in enumerate(horizontal)]
+    events += [(segment.high, 2, i) for i, segment in enumerate(horizontal)]
+    events += [(segment.fixed, 1, i) for i, segment in enumerate(vertical)]
+    events.sort()
+
+    active = []
+    for _, kind, i in events:
+        if kind == 0:
+            bisect.insort(active, (horizontal[i].fixed, i))
+        elif kind == 2:
+            del active[bisect.bisect_left(active, (horizontal[i].fixed, i))]
+        else:
+            segment_v = vertical[i]
+            low = segment_v.low, -1
+            high = segment_v.high, len(horizontal)
+            first = bisect.bisect_left(active, low)
+            last = bisect.bisect_right(active, high)
+            for _, j in active[first:last]:
+                yield horizontal[j], segment_v
+
+
+def collinear_crossings(segments_a, segments_b):
+    pairs = ((segment.fixed, segment) for segment in segments_a)
+    by_line = helpers.grouped(pairs)
+    for segment_b in segments_b:
+        for segment_a in by_line.get(segment_b.fixed, []):
+            low = max(segment_a.low, segment_b.low)
+            high = min(segment_a.high, segment_b.high)
+            if low > high:
+                continue
+            # Both delays are linear within the overlap, so their sum is
+            # smallest at one of its ends. The Manhattan distance is smallest
+            # at the point closest to the origin.
+            closest = min(max(0, low), high)
+            for position in {low, high, closest}:
+                delay = segment_a.delay(position) + segment_b.delay(position)
+                yield segment_b.fixed, position, delay
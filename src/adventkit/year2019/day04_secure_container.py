@@ -1,23 +1,76 @@
 import collections
 import itertools
-import string
 
 from adventkit import parse
 
 
 def solve(data):
-    lower_limit, upper_limit = parse.strings(data)
-    min_password = tuple(lower_limit)
-    max_password = tuple(upper_limit)
+    min_password, max_password = parse.strings(data)
+    simple_count, better_count = count_in_range(min_password, max_password)
+    print(simple_count)
+    print(better_count)
+
+
+def count_in_range(low, high):
+    # Passwords are counted separately for each number of digits. Limits with
+    # different numbers of digits are taken to have no leading zeros.
+    if (len(low), low) > (len(high), high):
+        return 0, 0
+    totals = [0, 0]
+    for length in range(len(low), len(high) + 1):
+        start = low if length == len(low) else "1" + "0" * (length - 1)
+        stop = high if length == len(high) else "9" * length
+        counts = zip(count_up_to(stop), count_up_to(start), rate(start))
+        for i, (above, below, own) in enumerate(counts):
+            totals[i] += above - below + own
+    return tuple(totals)
+
+
+def rate(password):
+    if list(password) != sorted(password):
+        return 0, 0
+    run_lengths = [len(list(run)) for _, run in itertools.groupby(password)]
+    return int(max(run_lengths) >= 2), int(2 in run_lengths)
+
+
+def count_up_to(limit):
+    # Count the passwords with as many digits as `limit` that aren't greater
+    # than `limit`, going through the digits from left to right. Passwords with
+    # the same prefix so far share a state: the last digit, the length of the
+    # current run of that digit (capped at 3), whether there has been a run of
+    # 2 or more, and whether a run of exactly 2 has ended. The prefix of
+    # `limit` itself is tracked separately.
+    counts = collections.Counter()
+    limit_state = -1, 0, False, False
+    for limit_digit in map(int, limit):
+        new_counts = collections.Counter()
+        for state, count in counts.items():
+            for digit in range(max(state[0], 0), 10):
+                new_counts[advance(state, digit)] += count
+        if limit_state is not None:
+            for digit in range(max(limit_state[0], 0), limit_digit):
+                new_counts[advance(limit_state, digit)] += 1
+            if limit_digit >= limit_state[0]:
+                limit_state = advance(limit_state, limit_digit)
+            else:
+                limit_state = None
+        counts = new_counts
+    if limit_state is not None:
+        counts[limit_state] += 1
 
     simple_count = 0
     better_count = 0
-    for password in itertools.combinations_with_replacement(string.digits, 6):
-        digit_counter = collections.Counter(password)
-        if min_password <= password <= max_password and len(digit_counter) < 6:
-            simple_count += 1
-            if 2 in digit_counter.values():
-                better_count += 1
+    for (_, run, has_pair, has_exact_pair), count in counts.items():
+        if has_pair:
+            simple_count += count
+            if has_exact_pair or run == 2:
+                better_count += count
+    return simple_count, better_count
 
-    print(simple_count)
-    print(better_count)
+
+def advance(state, digit):
+    last, run, has_pair, has_exact_pair = state
+    if digit == last:
+        run = min(run + 1, 3)
+        return last, run, has_pair or run >= 2, has_exact_pair
+    return digit, 1, has_pair, has_exact_pair or run == 2
@@ -1,30 +1,75 @@
+import array
+
 from adventkit import helpers, parse
 
 
 def solve(data):
-    direct_orbits = parse.string_rows(data)
-    print(count_orbits(direct_orbits))
-
-    parent_by_child = {child: parent for parent, child in direct_orbits}
-    you_ancestors = ancestors("YOU", parent_by_child)
-    santa_ancestors = ancestors("SAN", parent_by_child)
-    transfers = set(you_ancestors) ^ set(santa_ancestors)
-    print(len(transfers))
-
-
-def count_orbits(direct_orbits):
-    children = helpers.grouped(direct_orbits)
-    total = 0
-    num_ancestors = 0
-    frontier = ["COM"]
-    while frontier:
-        total += len(frontier) * num_ancestors
-        frontier = [child for node in frontier for child in children[node]]
-        num_ancestors += 1
-    return total
-
-
-def ancestors(node, parent_by_child):
-    while node in parent_by_child:
-        node = parent_by_child[node]
-        yield node
+    tree = OrbitTree(parse.string_rows(data))
+    print(count_orbits(tree))
+    print(tree.distance("YOU", "SAN") - 2)
+
+
+class OrbitTree:
+    # An index over an orbit map, for ancestor and distance queries. Objects
+    # are interned as integer IDs in breadth-first order, starting with 0 for
+    # the root. The arrays `parents` and `depths` are indexed by ID, and the
+    # root is its own parent. `jumps[k][i]` is the ancestor 2**k levels above
+    # the object with ID i, or the root if there's no such ancestor, so the
+    # common ancestor of two objects can be found in O(log n) steps.
+    def __init__(self, direct_orbits, root="COM"):
+        children = helpers.grouped(direct_orbits)
+        names = [root]
+        parents = array.array("q", [0])
+        depths = array.array("q", [0])
+        for i, name in enumerate(names):
+            for child in children[name]:
+                names.append(child)
+                parents.append(i)
+                depths.append(depths[i] + 1)
+
+        jumps = [parents]
+        for _ in range(max(depths).bit_length() - 1):
+            previous = jumps[-1]
+            jumps.append(array.array("q", map(previous.__getitem__, previous)))
+
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.names = names
+        self.parents = parents
+        self.depths = depths
+        self.jumps = jumps
+
+    def common_ancestor(self, name_a, name_b):
+        common = self._common_ancestor(self.ids[name_a], self.ids[name_b])
+        return self.names[common]
+
+    def distance(self, name_a, name_b):
+        a = self.ids[name_a]
+        b = self.ids[name_b]
+        common = self._common_ancestor(a, b)
+        depths = self.depths
+        return depths[a] + depths[b] - 2 * depths[common]
+
+    def _lift(self, i, levels):
+        k = 0
+        while levels:
+            if levels & 1:
+                i = self.jumps[k][i]
+            levels >>= 1
+            k += 1
+        return i
+
+    def _common_ancestor(self, a, b):
+        if self.depths[a] < self.depths[b]:
+            a, b = b, a
+        a = self._lift(a, self.depths[a] - self.depths[b])
+        if a == b:
+            return a
+        for jump in reversed(self.jumps):
+            if jump[a] != jump[b]:
+                a = jump[a]
+                b = jump[b]
+        return self.parents[a]
+
+
+def count_orbits(tree):
+    return sum(tree.depths)
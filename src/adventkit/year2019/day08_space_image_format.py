@@ -1,9 +1,12 @@
-from adventkit import helpers
+from adventkit import grids, helpers
 
 
 WIDTH = 25
 HEIGHT = 6
 
+BLACK = 0
+WHITE = 1
+
 
 def solve(data):
     image_data = data.strip()
@@ -12,15 +15,16 @@ def solve(data):
     chosen_layer = min(layers, key=lambda layer: layer.count("0"))
     print(chosen_layer.count("1") * chosen_layer.count("2"))
 
-    data_by_pixel = helpers.transpose(layers)
-    for row_data in helpers.chunked(data_by_pixel, WIDTH):
-        print(" ".join(decode(pixel_data) for pixel_data in row_data))
+    image = grids.Grid(WIDTH, HEIGHT)
+    for index, pixel_data in enumerate(helpers.transpose(layers)):
+        image.cells[index] = decode(pixel_data)
+    grids.show(image, {WHITE: "#"})
 
 
 def decode(pixel_data):
     for color in pixel_data:
         if color == "0":
-            return " "
+            return BLACK
         if color == "1":
-            return "#"
+            return WHITE
     raise ValueError("pixel is transparent all the way through")
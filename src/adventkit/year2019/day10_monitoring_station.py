@@ -1,22 +1,55 @@
-import fractions
+import functools
+import itertools
 import math
+import multiprocessing
+import os
 
 from adventkit import grids, helpers
 
 
+# Searching for the best station is spread across processes for asteroid
+# fields at least this large, if there's more than one CPU.
+PARALLEL_THRESHOLD = 2000
+
+# The asteroid field in a worker process, set once by init_worker().
+worker_asteroids = None
+
+
 def solve(data):
     asteroids = grids.select("#", data)
 
-    max_count, station = max(
-        (count_detectable(location, asteroids), location)
-        for location in asteroids
-    )
+    max_count, station = best_station(asteroids)
     print(max_count)
 
-    chosen_target = nth_vaporized(station, asteroids, n=200)
+    rays = ray_table(station, asteroids)
+    chosen_target = nth_vaporized(rays, n=200)
     print(100 * chosen_target.x + chosen_target.y)
 
 
+def best_station(asteroids):
+    locations = sorted(asteroids)
+    cpu_count = os.cpu_count() or 1
+    if len(locations) < PARALLEL_THRESHOLD or cpu_count == 1:
+        counts = [count_detectable(spot, asteroids) for spot in locations]
+    else:
+        # The asteroid set is sent to each worker only once, when it starts.
+        chunksize = -(-len(locations) // (4 * cpu_count))
+        with multiprocessing.Pool(
+            cpu_count, initializer=init_worker, initargs=(asteroids,)
+        ) as pool:
+            counts = pool.map(worker_count, locations, chunksize)
+    return max(zip(counts, locations))
+
+
+def init_worker(asteroids):
+    global worker_asteroids
+    worker_asteroids = asteroids
+
+
+def worker_count(location):
+    return count_detectable(location, worker_asteroids)
+
+
 def count_detectable(location, asteroids):
     targets = asteroids - {location}
     directions = {normalized_direction(location, target) for target in targets}
@@ -30,21 +63,42 @@ def normalized_direction(source, destination):
     return x // divisor, y // divisor
 
 
-def nth_vaporized(station, asteroids, n):
+def ray_table(station, asteroids):
     targets = asteroids - {station}
     rays = helpers.grouped(
-        (angle(station, target), target) for target in targets
+        (normalized_direction(station, target), target) for target in targets
     )
-    key = {}
-    for laser_angle, ray in rays.items():
+    for ray in rays.values():
         ray.sort(key=station.manhattan_distance)
-        for rotation, target in enumerate(ray):
-            key[target] = rotation, laser_angle
-    return sorted(targets, key=key.get)[n - 1]
+    directions = sorted(rays, key=functools.cmp_to_key(compare_angles))
+    return [rays[direction] for direction in directions]
+
+
+def compare_angles(a, b):
+    # Directions are ordered clockwise, starting with straight up.
+    half_a = half(a)
+    half_b = half(b)
+    if half_a != half_b:
+        return half_a - half_b
+    cross = a[0] * b[1] - a[1] * b[0]
+    return (cross < 0) - (cross > 0)
+
+
+def half(direction):
+    x, y = direction
+    return 0 if x > 0 or (x == 0 and y < 0) else 1
+
+
+def nth_vaporized(rays, n):
+    for count, target in enumerate(vaporization_order(rays), 1):
+        if count == n:
+            return target
+    raise ValueError(f"fewer than {n} asteroids to vaporize")
 
 
-def angle(source, destination):
-    x, y = destination - source
-    sector = 0 if x > 0 or (x == 0 and y <= 0) else 1
-    slope = fractions.Fraction(y, x) if x != 0 else -math.inf
-    return sector, slope
+def vaporization_order(rays):
+    for rotation in itertools.count():
+        remaining = [ray[rotation] for ray in rays if rotation < len(ray)]
+        if not remaining:
+            return
+        yield from remaining
@@ -17,7 +17,7 @@ def solve(data):
 
 
 def painted_panels(program, start_on_white=False):
-    hull = {}
+    hull = grids.SparseGrid()
     position = grids.ORIGIN_2D
     step = grids.UP
     if start_on_white:
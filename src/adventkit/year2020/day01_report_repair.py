@@ -1,16 +1,17 @@
-import itertools
-
 from adventkit import helpers, parse
 
 
+TARGET = 2020
+
+
 def solve(data):
     entries = parse.ints(data)
     print(find_product(entries, count=2))
     print(find_product(entries, count=3))
 
 
-def find_product(entries, count):
-    for combination in itertools.combinations(entries, count):
-        if sum(combination) == 2020:
-            return helpers.product(combination)
-    raise ValueError("no combination of values sums to 2020")
+def find_product(entries, count, target=TARGET):
+    combination = helpers.k_sum(entries, count, target)
+    if combination is None:
+        raise ValueError(f"no combination of values sums to {target}")
+    return helpers.product(combination)
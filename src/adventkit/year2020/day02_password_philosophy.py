@@ -1,17 +1,16 @@
 from adventkit import parse
 
 
-def solve(data):
-    rows = parse.mixed_rows(data)
+parse_policies = parse.row_parser("int-int str: str")
 
-    first_count = 0
-    for min_appearances, max_appearances, letter, password in rows:
-        if min_appearances <= password.count(letter) <= max_appearances:
-            first_count += 1
-    print(first_count)
 
+def solve(data):
+    first_count = 0
     second_count = 0
-    for low, high, letter, password in rows:
+    for low, high, letter, password in parse_policies(data):
+        if low <= password.count(letter) <= high:
+            first_count += 1
         if (password[low - 1] == letter) != (password[high - 1] == letter):
             second_count += 1
+    print(first_count)
     print(second_count)
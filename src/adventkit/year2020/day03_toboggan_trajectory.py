@@ -2,18 +2,19 @@ from adventkit import grids, helpers
 
 
 def solve(data):
-    trees, size = grids.select_and_measure("#", data)
+    trees = grids.Grid.select("#", data, wrap=True)
     slopes = (3, 1), (1, 1), (5, 1), (7, 1), (1, 2)
-    counts = [count_encounters(slope, trees, size) for slope in slopes]
+    counts = [count_encounters(slope, trees) for slope in slopes]
     print(counts[0])
     print(helpers.product(counts))
 
 
-def count_encounters(slope, trees, size):
-    position = grids.ORIGIN_2D
+def count_encounters(slope, trees):
+    step_x, step_y = slope
+    x, y = slope
     count = 0
-    while position.y < size.y:
-        position += slope
-        if (position.x % size.x, position.y) in trees:
-            count += 1
+    while y < trees.height:
+        count += trees[x, y]
+        x += step_x
+        y += step_y
     return count
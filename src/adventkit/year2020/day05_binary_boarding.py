@@ -1,12 +1,83 @@
+import collections
+import typing
+
+
+TO_BINARY = str.maketrans("FBLR", "0101")
+BYTES_TO_BINARY = bytes.maketrans(b"FBLR", b"0101")
+
+
+class SeatStats(typing.NamedTuple):
+    # Summary values of a sequence of seat IDs.
+    lowest: int
+    highest: int
+    count: int
+    total: int
+
+
 def solve(data):
-    binarized_data = data.translate(str.maketrans("FBLR", "0101"))
-    seat_ids = {int(line, base=2) for line in binarized_data.splitlines()}
-    print(max(seat_ids))
-    print(missing(seat_ids))
+    ids = seat_ids(data)
+    stats = seat_stats(ids)
+    print(stats.highest)
+    try:
+        free_seat = missing(stats)
+    except ValueError:
+        # There are several gaps, so look them up in a bitmap.
+        free_seat = gaps(ids)[0]
+    print(free_seat)
+
+
+def seat_ids(data):
+    # Return a list of the seat IDs. The whole manifest is translated at once,
+    # and `data` can be a string or a bytes-like object such as `bytes` or
+    # `mmap.mmap`.
+    if isinstance(data, str):
+        binarized_data = data.translate(TO_BINARY)
+    else:
+        binarized_data = bytes(data).translate(BYTES_TO_BINARY)
+    return [int(line, 2) for line in binarized_data.split()]
+
+
+def seat_stats(ids):
+    # Return the SeatStats of a sequence of seat IDs, computed by built-in
+    # functions rather than a Python loop. Raise a ValueError if an ID occurs
+    # twice.
+    if not ids:
+        raise ValueError("no seat IDs")
+    if len(set(ids)) != len(ids):
+        counts = collections.Counter(ids)
+        duplicate = next(i for i, count in counts.items() if count > 1)
+        raise ValueError(f"duplicate seat ID: {duplicate}")
+    return SeatStats(min(ids), max(ids), len(ids), sum(ids))
+
+
+def missing(stats):
+    # Find the free seat from the stats of distinct seat IDs: if one seat from
+    # the lowest to the highest is free, it's found from the sum. If none is,
+    # the seat after the highest is free. Raise a ValueError if several seats
+    # are free.
+    lowest, highest, count, total = stats
+    size = highest - lowest + 1
+    if count == size:
+        return highest + 1
+    if count == size - 1:
+        return (lowest + highest) * size // 2 - total
+    raise ValueError("seat IDs don't leave a single gap")
 
 
-def missing(seat_ids):
-    i = min(seat_ids)
-    while i in seat_ids:
-        i += 1
-    return i
+def gaps(ids):
+    # Return a sorted list of all missing IDs between the lowest and highest,
+    # using a bitmap with one bit per possible ID. Ten-letter boarding passes
+    # have IDs below 1024, so the bitmap takes at most 128 bytes.
+    if not ids:
+        return []
+    bitmap = bytearray()
+    for seat_id in ids:
+        index = seat_id >> 3
+        if index >= len(bitmap):
+            bitmap.extend(bytes(index + 1 - len(bitmap)))
+        bitmap[index] |= 1 << (seat_id & 7)
+    return [
+        seat_id
+        for seat_id in range(min(ids), max(ids) + 1)
+        if not bitmap[seat_id >> 3] >> (seat_id & 7) & 1
+    ]
@@ -1,38 +1,82 @@
-import functools
+import collections
 import re
+import typing
 
 
-def solve(data):
-    rules = parse_rules(data)
-    print(count_containers_of("shiny gold", rules))
+CONTENTS_REGEX = re.compile(r"(\d+) ([^,]+) bag")
+
 
-    @functools.lru_cache(maxsize=None)
-    def count_bags_in(color):
-        contents = rules[color]
-        return sum(n * (1 + count_bags_in(inner)) for n, inner in contents)
+class BagGraph(typing.NamedTuple):
+    # Bag rules, with each color interned as an integer ID. Both lists are
+    # indexed by ID: `contents` holds (count, inner ID) pairs, and
+    # `containers` holds the IDs of the bags that directly contain a bag.
+    ids: typing.Dict[str, int]
+    contents: typing.List[typing.List[typing.Tuple[int, int]]]
+    containers: typing.List[typing.List[int]]
 
-    print(count_bags_in("shiny gold"))
+
+def solve(data):
+    graph = parse_rules(data)
+    print(count_containers_of("shiny gold", graph))
+    print(count_bags_in("shiny gold", graph))
 
 
 def parse_rules(data):
-    rules = {}
+    ids = {}
+    contents = []
+    containers = []
+
+    def intern(color):
+        if color not in ids:
+            ids[color] = len(ids)
+            contents.append([])
+            containers.append([])
+        return ids[color]
+
     for line in data.splitlines():
         color, contents_text = line.split(" bags contain ")
-        items = re.findall(r"(\d+) ([^,]+) bag", contents_text)
-        rules[color] = [(int(n), inner) for n, inner in items]
-    return rules
-
-
-def count_containers_of(target, rules):
-    @functools.lru_cache(maxsize=None)
-    def contains_target(color):
-        contents = rules[color]
-        return any(
-            inner == target or contains_target(inner) for _, inner in contents
-        )
-
-    count = 0
-    for color in rules:
-        if contains_target(color):
-            count += 1
-    return count
+        outer = intern(color)
+        for n, inner_color in CONTENTS_REGEX.findall(contents_text):
+            inner = intern(inner_color)
+            contents[outer].append((int(n), inner))
+            containers[inner].append(outer)
+    return BagGraph(ids, contents, containers)
+
+
+def count_containers_of(target, graph):
+    start = graph.ids[target]
+    seen = {start}
+    queue = collections.deque([start])
+    while queue:
+        for outer in graph.containers[queue.popleft()]:
+            if outer not in seen:
+                seen.add(outer)
+                queue.append(outer)
+    return len(seen) - 1
+
+
+def count_bags_in(color, graph):
+    # Depth-first search with an explicit stack. A bag's total is computed
+    # when it's on top of the stack for the second time, after the totals of
+    # all the bags inside it.
+    new, open_, done = range(3)
+    states = bytearray(len(graph.ids))
+    totals = [0] * len(graph.ids)
+    stack = [graph.ids[color]]
+    while stack:
+        outer = stack[-1]
+        if states[outer] == new:
+            states[outer] = open_
+            for _, inner in graph.contents[outer]:
+                if states[inner] == open_:
+                    raise ValueError("bag rules contain a cycle")
+                if states[inner] == new:
+                    stack.append(inner)
+            continue
+        stack.pop()
+        if states[outer] == open_:
+            totals[outer] = sum(
+                n * (1 + totals[inner]) for n, inner in graph.contents[outer]
+            )
+            states[outer] = done
+    return totals[graph.ids[color]]
@@ -1,37 +1,118 @@
+import array
+
 from adventkit import parse
 
 
+ACC = 0
+JMP = 1
+NOP = 2
+
+OPCODES = {"acc": ACC, "jmp": JMP, "nop": NOP}
+
+parse_instructions = parse.row_parser("str int")
+
+
 def solve(data):
-    instructions = parse.mixed_rows(data)
-    output, _ = run(instructions)
+    ops, args = compile_program(parse_instructions(data))
+    output, _ = run(ops, args)
     print(output)
-    print(fixed_output(instructions))
+    print(fixed_output(ops, args))
+
 
+def compile_program(instructions):
+    ops = bytearray()
+    args = array.array("q")
+    for op, arg in instructions:
+        ops.append(OPCODES[op])
+        args.append(arg)
+    return ops, args
 
-def run(instructions):
+
+def run(ops, args):
     pointer = 0
     accumulator = 0
-    seen = set()
-    while 0 <= pointer < len(instructions) and pointer not in seen:
-        seen.add(pointer)
-        op, arg = instructions[pointer]
-        if op == "jmp":
-            pointer += arg
+    seen = bytearray(len(ops))
+    while 0 <= pointer < len(ops) and not seen[pointer]:
+        seen[pointer] = 1
+        op = ops[pointer]
+        if op == JMP:
+            pointer += args[pointer]
             continue
-        if op == "acc":
-            accumulator += arg
+        if op == ACC:
+            accumulator += args[pointer]
         pointer += 1
-    return accumulator, pointer == len(instructions)
+    return accumulator, pointer == len(ops)
 
 
-def fixed_output(instructions):
-    for i, (op, arg) in enumerate(instructions):
-        if op == "acc":
-            continue
-        new_op = {"jmp": "nop", "nop": "jmp"}[op]
-        new_instructions = instructions.copy()
-        new_instructions[i] = [new_op, arg]
-        output, terminated = run(new_instructions)
+def fixed_output(ops, args):
+    fixed_ops = bytearray(ops)
+    for address in repair_candidates(ops, args):
+        fixed_ops[address] = flip(ops[address])
+        output, terminated = run(fixed_ops, args)
         if terminated:
             return output
+        fixed_ops[address] = ops[address]
     raise ValueError("no valid solution exists")
+
+
+def repair_candidates(ops, args):
+    _, terminated = run(ops, args)
+    if terminated:
+        # The analysis in find_fix() assumes that the program loops, so just
+        # try every instruction in order.
+        return [address for address, op in enumerate(ops) if op != ACC]
+    return [find_fix(ops, args)]
+
+
+def find_fix(ops, args):
+    # Flipping an instruction on the path that the program actually takes
+    # fixes it if the flipped instruction leads to an address from which the
+    # unchanged program terminates. That path can't lead back to the flipped
+    # instruction, because it's part of an infinite loop.
+    reaches_end = terminating_addresses(ops, args)
+    candidates = []
+    for address in execution_path(ops, args):
+        if ops[address] == ACC:
+            continue
+        target = successor(flip(ops[address]), args[address], address)
+        if 0 <= target <= len(ops) and reaches_end[target]:
+            candidates.append(address)
+    if not candidates:
+        raise ValueError("no valid solution exists")
+    return min(candidates)
+
+
+def terminating_addresses(ops, args):
+    size = len(ops)
+    predecessors = [[] for _ in range(size + 1)]
+    for address, (op, arg) in enumerate(zip(ops, args)):
+        target = successor(op, arg, address)
+        if 0 <= target <= size:
+            predecessors[target].append(address)
+
+    reaches_end = bytearray(size + 1)
+    reaches_end[size] = 1
+    stack = [size]
+    while stack:
+        for address in predecessors[stack.pop()]:
+            if not reaches_end[address]:
+                reaches_end[address] = 1
+                stack.append(address)
+    return reaches_end
+
+
+def execution_path(ops, args):
+    pointer = 0
+    seen = bytearray(len(ops))
+    while 0 <= pointer < len(ops) and not seen[pointer]:
+        seen[pointer] = 1
+        yield pointer
+        pointer = successor(ops[pointer], args[pointer], pointer)
+
+
+def successor(op, arg, address):
+    return address + arg if op == JMP else address + 1
+
+
+def flip(op):
+    return {JMP: NOP, NOP: JMP}[op]
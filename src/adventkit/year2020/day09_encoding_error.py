@@ -1,35 +1,91 @@
-import itertools
+import collections
 
 from adventkit import parse
 
 
+PREAMBLE_LENGTH = 25
+
+
 def solve(data):
-    numbers = parse.ints(data)
-    invalid = find_invalid(numbers)
+    invalid = find_invalid(parse.iter_ints(data))
     print(invalid)
-    print(weakness(numbers, invalid))
+    weakness = window_weakness(parse.iter_ints(data), invalid)
+    if weakness is None:
+        weakness = prefix_weakness(parse.iter_ints(data), invalid)
+    print(weakness)
 
 
-def find_invalid(numbers):
-    for i in range(25, len(numbers)):
-        target = numbers[i]
-        previous = numbers[i - 25 : i]
-        pairs = itertools.combinations(previous, 2)
-        if not any(a + b == target and a != b for a, b in pairs):
-            return target
+def find_invalid(numbers, preamble_length=PREAMBLE_LENGTH):
+    window = collections.deque()
+    counts = collections.Counter()
+    for number in numbers:
+        if len(window) == preamble_length:
+            if not is_pair_sum(number, counts):
+                return number
+            oldest = window.popleft()
+            counts[oldest] -= 1
+            if not counts[oldest]:
+                del counts[oldest]
+        window.append(number)
+        counts[number] += 1
     raise ValueError("no invalid number exists")
 
 
-def weakness(numbers, target):
-    for size in range(2, len(numbers) + 1):
-        window_sum = sum(numbers[:size])
-        for low in itertools.count():
-            high = low + size
-            if window_sum == target:
-                window = numbers[low:high]
-                return min(window) + max(window)
-            if high == len(numbers):
+def is_pair_sum(target, counts):
+    return any(target - a in counts and target - a != a for a in counts)
+
+
+def window_weakness(numbers, target):
+    # Find the shortest range of at least two numbers that adds up to
+    # `target`, or the first one of the shortest ones. While no number is
+    # negative, a sliding window suffices: a window that adds up to too much
+    # can only become smaller by dropping numbers at its start. Return None as
+    # soon as a negative number turns up.
+    window = collections.deque()
+    window_sum = 0
+    best = None
+    for number in numbers:
+        if number < 0:
+            return None
+        window.append(number)
+        window_sum += number
+        while window_sum > target and window:
+            window_sum -= window.popleft()
+        # Leading zeros only make the window longer.
+        while len(window) > 2 and window[0] == 0:
+            window.popleft()
+        if window_sum == target and len(window) >= 2:
+            if best is None or len(window) < best[0]:
+                best = len(window), min(window) + max(window)
+    if best is None:
+        raise ValueError("no encryption weakness exists")
+    return best[1]
+
+
+def prefix_weakness(numbers, target):
+    # Find the same range as window_weakness(), for numbers of any sign. The
+    # numbers from index i up to index j add up to `target` if the prefix sums
+    # before i and before j differ by `target`. The last two indices of each
+    # prefix sum are kept, so the shortest such range of at least two numbers
+    # ending at j can be found.
+    seen = []
+    last_indices = {0: [0]}
+    prefix_sum = 0
+    best = None
+    for number in numbers:
+        seen.append(number)
+        prefix_sum += number
+        end = len(seen)
+        for start in reversed(last_indices.get(prefix_sum - target, ())):
+            if end - start >= 2:
+                if best is None or end - start < best[1] - best[0]:
+                    best = start, end
                 break
-            window_sum -= numbers[low]
-            window_sum += numbers[high]
-    raise ValueError("no encryption weakness exists")
+        indices = last_indices.setdefault(prefix_sum, [])
+        indices.append(end)
+        if len(indices) > 2:
+            del indices[0]
+    if best is None:
+        raise ValueError("no encryption weakness exists")
+    window = seen[best[0] : best[1]]
+    return min(window) + max(window)
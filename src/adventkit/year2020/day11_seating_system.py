@@ -1,34 +1,120 @@
 from adventkit import grids
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def solve(data):
-    seats, size = grids.select_and_measure("L", data)
 
-    adjacent = {seat: set(seat.neighbors()) & seats for seat in seats}
-    print(final_count(seats, adjacent, crowded=4))
+def solve(data):
+    layout = grids.Grid.select("L", data)
 
-    visible = {seat: set(visible_from(seat, seats, size)) for seat in seats}
-    print(final_count(seats, visible, crowded=5))
+    if numpy is None:
+        seats = [index for index, value in enumerate(layout.cells) if value]
+        adjacent = grids.neighbor_table(layout)
+        print(final_count(seats, adjacent, crowded=4))
+        visible = grids.sight_table(layout)
+        print(final_count(seats, visible, crowded=5))
+    else:
+        seats = numpy.frombuffer(layout.cells, dtype=numpy.uint8) != 0
+        count_adjacent = adjacent_counter(layout)
+        print(vectorized_final_count(seats, count_adjacent, crowded=4))
+        visible = sight_index(layout)
+        everyone = numpy.ones(len(visible), dtype=bool)
+        count_visible = table_counter(visible)
+        print(vectorized_final_count(everyone, count_visible, crowded=5))
 
 
 def final_count(seats, neighbors, crowded):
-    occupied = set()
+    def rule(occupied, count):
+        return count == 0 or (occupied and count < crowded)
+
+    return grids.settle(seats, neighbors, rule).count(1)
+
+
+def vectorized_final_count(seats, count_neighbors, crowded):
+    occupied = numpy.zeros_like(seats)
     while True:
-        new = set()
-        for seat in seats:
-            count = len(neighbors[seat] & occupied)
-            if count == 0 or (seat in occupied and count < crowded):
-                new.add(seat)
-        if new == occupied:
-            return len(occupied)
+        counts = count_neighbors(occupied)
+        new = seats & ((counts == 0) | (occupied & (counts < crowded)))
+        if numpy.array_equal(new, occupied):
+            return int(numpy.count_nonzero(new))
         occupied = new
 
 
-def visible_from(seat, seats, size):
-    for step in grids.ORIGIN_2D.neighbors():
-        other = seat + step
-        while 0 <= other.x < size.x and 0 <= other.y < size.y:
-            if other in seats:
-                yield other
-                break
-            other += step
+def adjacent_counter(layout):
+    width = layout.width
+    height = layout.height
+    padded = numpy.zeros((height + 2, width + 2), dtype=numpy.int8)
+
+    def count_neighbors(occupied):
+        padded[1:-1, 1:-1] = occupied.reshape(height, width)
+        counts = numpy.zeros((height, width), dtype=numpy.int8)
+        for step_x, step_y in grids.ALL_STEPS:
+            x = 1 + step_x
+            y = 1 + step_y
+            counts += padded[y : y + height, x : x + width]
+        return counts.ravel()
+
+    return count_neighbors
+
+
+def sight_index(layout):
+    # Return an int32 array with a row for each seat, in the order of the cell
+    # indices, holding the numbers of the nearest seats in the eight
+    # directions. Where no seat is in sight, the row refers to an extra seat
+    # with the number len(rows).
+    shape = layout.height, layout.width
+    seats = numpy.frombuffer(layout.cells, dtype=numpy.uint8) != 0
+    seats = seats.reshape(shape)
+    count = int(numpy.count_nonzero(seats))
+    numbers = numpy.full(shape, -1, dtype=numpy.int32)
+    numbers[seats] = numpy.arange(count, dtype=numpy.int32)
+    index = numpy.full((count, 8), count, dtype=numpy.int32)
+    for direction, step in enumerate(((1, 0), (0, 1), (1, 1), (-1, 1))):
+        previous = previous_seats(numbers, step)[seats]
+        found = numpy.flatnonzero(previous != -1)
+        index[found, 2 * direction] = previous[found]
+        index[previous[found], 2 * direction + 1] = found
+    return index
+
+
+def previous_seats(numbers, step):
+    # For each cell, find the number of the nearest seat before it on the line
+    # running in direction `step`, or -1 if there's none. Seat numbers grow
+    # along each line, so the nearest seat so far is the running maximum.
+    step_x, step_y = step
+    height, width = numbers.shape
+    here_x, there_x = shifted_slices(step_x, width)
+    here_y, there_y = shifted_slices(step_y, height)
+    if step_y == 0:
+        latest = numpy.maximum.accumulate(numbers, axis=1)
+    elif step_x == 0:
+        latest = numpy.maximum.accumulate(numbers, axis=0)
+    else:
+        latest = numbers.copy()
+        for y in range(1, height):
+            row = latest[y, here_x]
+            numpy.maximum(row, latest[y - 1, there_x], out=row)
+    previous = numpy.full_like(numbers, -1)
+    previous[here_y, here_x] = latest[there_y, there_x]
+    return previous
+
+
+def shifted_slices(step, size):
+    # Return a pair of slices such that the items selected by the first are
+    # `step` places after those selected by the second.
+    if step >= 0:
+        return slice(step, size), slice(0, size - step)
+    return slice(0, size + step), slice(-step, size)
+
+
+def table_counter(index):
+    # Count the occupied seats among those listed in each row of `index`, in
+    # which the number len(index) refers to an extra seat that's never
+    # occupied.
+    def count_neighbors(occupied):
+        padded = numpy.append(occupied, False)
+        return padded[index].sum(axis=1, dtype=numpy.int8)
+
+    return count_neighbors
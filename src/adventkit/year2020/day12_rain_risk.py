@@ -1,6 +1,23 @@
+import itertools
+
 from adventkit import grids, parse
 
 
+DIRECTIONS = {
+    "N": grids.NORTH,
+    "S": grids.SOUTH,
+    "E": grids.EAST,
+    "W": grids.WEST,
+}
+
+# A transform maps the ship's position and its step (the direction, or the
+# waypoint in waypoint mode) to new ones. It's a pair of tuples of integers
+# (a, b, c, d, tx, ty). The step is mapped by the affine map with the matrix
+# ((a, b), (c, d)) and the translation (tx, ty). The position moves by the
+# old step mapped in the same way by the first tuple.
+IDENTITY = (0, 0, 0, 0, 0, 0), (1, 0, 0, 1, 0, 0)
+
+
 def solve(data):
     instructions = parse.mixed_rows(data)
     print(final_distance(instructions, step=grids.EAST))
@@ -18,15 +35,78 @@ def final_distance(instructions, step, waypoint_mode=False):
             step = step.rotate_right(value // 90)
         elif action == "F":
             pos += step * value
+        elif waypoint_mode:
+            step += DIRECTIONS[action] * value
         else:
-            direction = {
-                "N": grids.NORTH,
-                "S": grids.SOUTH,
-                "E": grids.EAST,
-                "W": grids.WEST,
-            }[action]
-            if waypoint_mode:
-                step += direction * value
-            else:
-                pos += direction * value
+            pos += DIRECTIONS[action] * value
     return pos.manhattan_distance(grids.ORIGIN_2D)
+
+
+def prefix_transforms(instructions, waypoint_mode=False):
+    # The transform at index k applies the first k instructions, so the state
+    # after any prefix can be found without replaying the instructions.
+    transforms = (
+        instruction_transform(action, value, waypoint_mode)
+        for action, value in instructions
+    )
+    return [IDENTITY, *itertools.accumulate(transforms, compose)]
+
+
+def instruction_transform(action, value, waypoint_mode=False):
+    if action in ("L", "R"):
+        turns = value // 90 if action == "L" else -(value // 90)
+        a, c = grids.EAST.rotate_left(turns)
+        b, d = grids.SOUTH.rotate_left(turns)
+        return (0, 0, 0, 0, 0, 0), (a, b, c, d, 0, 0)
+    if action == "F":
+        return (value, 0, 0, value, 0, 0), (1, 0, 0, 1, 0, 0)
+    x, y = DIRECTIONS[action] * value
+    if waypoint_mode:
+        return (0, 0, 0, 0, 0, 0), (1, 0, 0, 1, x, y)
+    return (0, 0, 0, 0, x, y), (1, 0, 0, 1, 0, 0)
+
+
+def compose(first, second):
+    # Return the transform that applies `first` and then `second`.
+    (a1, b1, c1, d1, px1, py1), (ra1, rb1, rc1, rd1, wx1, wy1) = first
+    (a2, b2, c2, d2, px2, py2), (ra2, rb2, rc2, rd2, wx2, wy2) = second
+    ship = (
+        a1 + a2 * ra1 + b2 * rc1,
+        b1 + a2 * rb1 + b2 * rd1,
+        c1 + c2 * ra1 + d2 * rc1,
+        d1 + c2 * rb1 + d2 * rd1,
+        px1 + a2 * wx1 + b2 * wy1 + px2,
+        py1 + c2 * wx1 + d2 * wy1 + py2,
+    )
+    step = (
+        ra2 * ra1 + rb2 * rc1,
+        ra2 * rb1 + rb2 * rd1,
+        rc2 * ra1 + rd2 * rc1,
+        rc2 * rb1 + rd2 * rd1,
+        ra2 * wx1 + rb2 * wy1 + wx2,
+        rc2 * wx1 + rd2 * wy1 + wy2,
+    )
+    return ship, step
+
+
+def repeated(transform, times):
+    result = IDENTITY
+    while times:
+        if times & 1:
+            result = compose(result, transform)
+        transform = compose(transform, transform)
+        times >>= 1
+    return result
+
+
+def apply_transform(transform, pos, step):
+    (a, b, c, d, px, py), (ra, rb, rc, rd, wx, wy) = transform
+    x, y = pos
+    step_x, step_y = step
+    new_pos = grids.Vector2D(
+        x + a * step_x + b * step_y + px, y + c * step_x + d * step_y + py
+    )
+    new_step = grids.Vector2D(
+        ra * step_x + rb * step_y + wx, rc * step_x + rd * step_y + wy
+    )
+    return new_pos, new_step
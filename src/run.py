@@ -7,4 +7,5 @@ import sys
 from adventkit import solve
 
 
-sys.exit(solve.main())
+if __name__ == "__main__":
+    sys.exit(solve.main())
@@ -0,0 +1,65 @@
+"""Shared fixtures for the tests."""
+
+import random
+
+import pytest
+
+from adventkit import grids
+
+
+SIZES = [(0, 0), (0, 3), (3, 0), (1, 1), (1, 7), (7, 1), (2, 2), (9, 13)]
+
+
+def _random_grids(seed=0, trials=10):
+    """Return an iterator over random grids of the sizes in SIZES."""
+
+    rng = random.Random(seed)
+    for width, height in SIZES:
+        for _ in range(trials):
+            grid = grids.Grid(width, height)
+            density = rng.random()
+            grid.cells[:] = bytes(
+                rng.random() < density for _ in range(width * height)
+            )
+            yield grid
+
+
+def _walk_rays(grid, steps, *, max_distance=None, wrap=False):
+    """Return the rows of a neighbor or sight table, found by walking rays."""
+
+    width = grid.width
+    height = grid.height
+    rows = []
+    for index, value in enumerate(grid.cells):
+        row = []
+        if value:
+            x, y = grid.point(index)
+            for step_x, step_y in steps:
+                distance = 1
+                while max_distance is None or distance <= max_distance:
+                    other_x = x + distance * step_x
+                    other_y = y + distance * step_y
+                    if wrap:
+                        other_x %= width
+                        other_y %= height
+                    elif not (0 <= other_x < width and 0 <= other_y < height):
+                        break
+                    other = other_y * width + other_x
+                    if grid.cells[other]:
+                        row.append(other)
+                        break
+                    distance += 1
+        rows.append(sorted(row))
+    return rows
+
+
+@pytest.fixture
+def random_grids():
+    """Provide a function returning random grids of various sizes."""
+    return _random_grids
+
+
+@pytest.fixture
+def walk_rays():
+    """Provide a function finding neighbors or visible cells by brute force."""
+    return _walk_rays
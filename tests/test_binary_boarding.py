@@ -0,0 +1,67 @@
+"""Tests of the boarding pass decoder for 2020, day 5."""
+
+import pytest
+
+from adventkit.year2020 import day05_binary_boarding
+
+
+def boarding_pass(seat_id):
+    """Return the boarding pass for a seat ID."""
+
+    row = format(seat_id >> 3, "07b").translate(str.maketrans("01", "FB"))
+    column = format(seat_id & 7, "03b").translate(str.maketrans("01", "LR"))
+    return row + column
+
+
+def manifest(seat_ids):
+    """Return the puzzle input listing the boarding passes of the seats."""
+
+    return "".join(boarding_pass(seat_id) + "\n" for seat_id in seat_ids)
+
+
+@pytest.mark.parametrize(
+    "seat_ids,expected",
+    [
+        ([357, 358, 356, 355, 353, 359], "359\n354\n"),
+        ([5, 3, 4], "5\n6\n"),
+        ([99, 100, 101, 103, 104, 105, 106, 108], "108\n102\n"),
+        ([1023, 1020], "1023\n1021\n"),
+    ],
+)
+def test_solve(seat_ids, expected, capsys):
+    """Test that str, bytes and memoryview input give the same answers."""
+
+    data = manifest(seat_ids)
+    for text in [data, data.encode("ascii"), memoryview(data.encode())]:
+        day05_binary_boarding.solve(text)
+        assert capsys.readouterr().out == expected
+
+
+def test_seat_ids():
+    """Test decoding bytes with any line endings."""
+
+    ids = day05_binary_boarding.seat_ids(b"FBFBBFFRLR\r\nBFFFBBFRRR\n")
+    assert ids == [357, 567]
+    with pytest.raises(ValueError):
+        day05_binary_boarding.seat_ids(b"FBFBBFFRLR\nbad\n")
+
+
+def test_duplicate():
+    """Test that a duplicated boarding pass is rejected."""
+
+    data = manifest([99, 100, 101, 103, 104, 105, 106, 106, 108])
+    with pytest.raises(ValueError, match="duplicate seat ID: 106"):
+        day05_binary_boarding.solve(data)
+
+
+def test_gaps():
+    """Test finding every gap with the bitmap."""
+
+    ids = [17, 8, 9, 12, 15, 16, 10]
+    stats = day05_binary_boarding.seat_stats(ids)
+    assert stats == (8, 17, 7, 87)
+    assert day05_binary_boarding.gaps(ids) == [11, 13, 14]
+    with pytest.raises(ValueError):
+        day05_binary_boarding.missing(stats)
+    with pytest.raises(ValueError):
+        day05_binary_boarding.seat_stats([])
@@ -0,0 +1,31 @@
+"""Tests of the checksum for 2017, day 2."""
+
+import pytest
+
+from adventkit import helpers
+from adventkit.year2017 import day02_corruption_checksum
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [[5, 1, 9, 5], [7, 5, 3, 0], [2, 4, 6, 8]],
+        [[5, 1, 9, 5], [7, 5, 3], [2, 4, 6, 8]],
+        [[3], [-(2**63)], [2**63 - 1]],
+        [[1, 2], [], [3, 4]],
+        [[], []],
+        [],
+    ],
+)
+def test_checksum(rows, monkeypatch):
+    """Test checksum() with and without NumPy on equal and unequal rows."""
+
+    table = helpers.IntTable(rows)
+    for numpy in [day02_corruption_checksum.numpy, None]:
+        monkeypatch.setattr(day02_corruption_checksum, "numpy", numpy)
+        if all(rows):
+            expected = sum(max(row) - min(row) for row in rows)
+            assert day02_corruption_checksum.checksum(table) == expected
+        else:
+            with pytest.raises(ValueError):
+                day02_corruption_checksum.checksum(table)
@@ -0,0 +1,99 @@
+"""Tests of the XMAS cipher analysis for 2020, day 9."""
+
+import itertools
+import random
+
+import pytest
+
+from adventkit.year2020 import day09_encoding_error
+
+
+EXAMPLE = [35, 20, 15, 25, 47, 40, 62, 55, 65, 95]
+EXAMPLE += [102, 117, 150, 182, 127, 219, 299, 277, 309, 576]
+
+
+def find_invalid_naively(numbers, preamble_length):
+    """Find the first number that isn't a sum of two earlier numbers."""
+
+    for i in range(preamble_length, len(numbers)):
+        previous = numbers[i - preamble_length : i]
+        pairs = itertools.combinations(previous, 2)
+        if not any(a + b == numbers[i] and a != b for a, b in pairs):
+            return numbers[i]
+    return None
+
+
+def weakness_naively(numbers, target):
+    """Return min + max of the first shortest range adding up to `target`."""
+
+    for size in range(2, len(numbers) + 1):
+        for low in range(len(numbers) - size + 1):
+            window = numbers[low : low + size]
+            if sum(window) == target:
+                return min(window) + max(window)
+    return None
+
+
+def test_example():
+    """Test the puzzle example, which has a preamble of length 5."""
+
+    invalid = day09_encoding_error.find_invalid(EXAMPLE, preamble_length=5)
+    assert invalid == 127
+    assert day09_encoding_error.window_weakness(EXAMPLE, invalid) == 62
+    assert day09_encoding_error.prefix_weakness(EXAMPLE, invalid) == 62
+
+
+@pytest.mark.parametrize(
+    "numbers,preamble_length,expected",
+    [
+        ([1, 2, 3, 4, 5, 9], 2, 4),
+        ([0, 0, 0, 1, 1, 2], 3, 1),
+        ([3, 3, 6, 9, 15], 2, 6),
+        ([-4, 7, 3, -1, 2, 2, 11], 3, 11),
+        ([5, -5, 0, 0, 7], 2, 0),
+    ],
+)
+def test_find_invalid(numbers, preamble_length, expected):
+    """Test find_invalid() with short preambles, zeros and negatives."""
+
+    result = day09_encoding_error.find_invalid(numbers, preamble_length)
+    assert result == expected
+    assert result == find_invalid_naively(numbers, preamble_length)
+
+
+def test_find_invalid_none():
+    """Test that a ValueError is raised if every number is valid."""
+
+    with pytest.raises(ValueError):
+        day09_encoding_error.find_invalid([1, 2, 3, 5, 8], preamble_length=2)
+
+
+def test_negative_fallback():
+    """Test that only the prefix sums handle negative numbers."""
+
+    numbers = [3, 10, -8]
+    assert day09_encoding_error.window_weakness(numbers, 5) is None
+    assert day09_encoding_error.prefix_weakness(numbers, 5) == 2
+
+
+@pytest.mark.parametrize("low", [0, -5])
+def test_random_weakness(low):
+    """Test both weakness searches against trying every range."""
+
+    rng = random.Random(low)
+    for _ in range(300):
+        numbers = [rng.randint(low, 9) for _ in range(rng.randint(2, 12))]
+        target = rng.randint(-5, 30)
+        expected = weakness_naively(numbers, target)
+        window_weakness = day09_encoding_error.window_weakness
+        searches = [day09_encoding_error.prefix_weakness]
+        if min(numbers) < 0:
+            assert window_weakness(numbers, target) is None
+        else:
+            searches.append(window_weakness)
+        for search in searches:
+            if expected is None:
+                with pytest.raises(ValueError):
+                    search(numbers, target)
+            else:
+                assert search(numbers, target) == expected, numbers
@@ -0,0 +1,291 @@
+"""Tests of the grid tools."""
+
+import io
+import random
+
+import pytest
+
+from adventkit import grids
+
+
+def render_cells(grid, symbols):
+    """Render a mapping one cell at a time, like show() used to."""
+
+    visible = [point for point, value in grid.items() if value in symbols]
+    if not visible:
+        return ""
+    visible_x = {x for x, _ in visible}
+    visible_y = {y for _, y in visible}
+    x_range = range(min(visible_x), max(visible_x) + 1)
+    y_range = range(min(visible_y), max(visible_y) + 1)
+    lines = []
+    for y in y_range:
+        row = (grid.get((x, y)) for x in x_range)
+        lines.append(" ".join(symbols.get(value, " ") for value in row))
+    return "".join(line + "\n" for line in lines)
+
+
+def sorted_rows(table):
+    """Return the rows of an IntTable as sorted lists."""
+    return [sorted(row) for row in table.tolist()]
+
+
+def test_sight_table(random_grids, walk_rays):
+    """Test sight_table() against walking a ray in each direction."""
+
+    for grid in random_grids():
+        expected = walk_rays(grid, grids.ALL_STEPS)
+        assert sorted_rows(grids.sight_table(grid)) == expected, grid.cells
+
+
+@pytest.mark.parametrize("diagonal", [True, False])
+@pytest.mark.parametrize("wrap", [False, True])
+def test_neighbor_table(diagonal, wrap, random_grids, walk_rays):
+    """Test neighbor_table() against looking one step in each direction."""
+
+    steps = grids.ALL_STEPS if diagonal else grids.ORTHOGONAL_STEPS
+    for grid in random_grids(seed=1):
+        if wrap and not grid.cells:
+            continue
+        grid.wrap = wrap
+        expected = walk_rays(grid, steps, max_distance=1, wrap=wrap)
+        table = grids.neighbor_table(grid, diagonal=diagonal)
+        assert sorted_rows(table) == expected, grid.cells
+
+
+def settle_naively(cells, neighbors, rule):
+    """Run a cellular automaton, evaluating every cell in every generation."""
+
+    alive = bytearray(len(neighbors))
+    while True:
+        new = bytearray(len(neighbors))
+        for cell in cells:
+            count = sum(alive[other] for other in neighbors[cell])
+            new[cell] = bool(rule(bool(alive[cell]), count))
+        if new == alive:
+            return alive
+        alive = new
+
+
+def spread(alive, count):
+    """Return whether a cell is alive under a rule that never kills."""
+    return alive or count == 1
+
+
+def seating(alive, count):
+    """Return whether a seat is taken under the 2020 day 11 rule."""
+    return count == 0 or (alive and count < 4)
+
+
+@pytest.mark.parametrize("rule", [spread, seating])
+def test_settle(rule, random_grids):
+    """Test settle() against recomputing every cell in every generation."""
+
+    rng = random.Random(8)
+    for grid in random_grids(seed=7, trials=4):
+        for diagonal in [True, False]:
+            neighbors = grids.neighbor_table(grid, diagonal=diagonal)
+            nonzero = [i for i, value in enumerate(grid.cells) if value]
+            for cells in [nonzero, rng.sample(nonzero, len(nonzero) // 2)]:
+                expected = settle_naively(cells, neighbors, rule)
+                assert grids.settle(cells, neighbors, rule) == expected
+
+
+def test_sparse_grid():
+    """Test a SparseGrid against a dict, across tile boundaries."""
+
+    rng = random.Random(4)
+    grid = grids.SparseGrid()
+    expected = {}
+    assert grid.bounds is None
+    span = 2 * grids.TILE_SIZE + 3
+    for _ in range(500):
+        point = grids.Vector2D(rng.randint(-span, span), rng.randint(-span, 5))
+        value = rng.randrange(3)
+        grid[point] = value
+        expected[point] = value
+        assert len(grid) == len(expected)
+        min_x = min(x for x, _ in expected)
+        min_y = min(y for _, y in expected)
+        max_x = max(x for x, _ in expected)
+        max_y = max(y for _, y in expected)
+        assert grid.bounds == ((min_x, min_y), (max_x, max_y))
+    assert dict(grid.items()) == expected
+    assert set(grid) == set(expected)
+    for x in range(-span - 1, span + 2):
+        for y in (-span - 1, -grids.TILE_SIZE, -1, 0, 5, 6):
+            assert grid.get((x, y)) == expected.get((x, y))
+            assert ((x, y) in grid) == ((x, y) in expected)
+    with pytest.raises(KeyError):
+        grids.SparseGrid()[0, 0]
+    with pytest.raises(ValueError):
+        grid[0, 0] = 255
+
+
+def test_sparse_grid_edges():
+    """Test the cells on both sides of the tile boundaries at zero."""
+
+    points = [(-1, -1), (0, 0), (-1, 0), (0, -1)]
+    points += [(grids.TILE_SIZE, -grids.TILE_SIZE - 1)]
+    points += [(-grids.TILE_SIZE - 1, grids.TILE_SIZE)]
+    grid = grids.SparseGrid((point, i) for i, point in enumerate(points))
+    assert len(grid.tiles) == 6
+    assert [grid[point] for point in points] == list(range(len(points)))
+    assert grid.bounds == ((-33, -33), (32, 32))
+    grid[0, 0] = 7
+    assert len(grid) == len(points)
+    assert grid[0, 0] == 7
+
+
+def test_render_sparse_grid():
+    """Test rendering a SparseGrid tile by tile, one cell at a time."""
+
+    rng = random.Random(5)
+    symbols_list = [{1: "#"}, {0: ".", 1: "#"}, {2: "o", 0: "-"}, {9: "x"}]
+    for _ in range(20):
+        span = rng.choice([3, grids.TILE_SIZE, 3 * grids.TILE_SIZE])
+        items = {}
+        for _ in range(rng.randint(0, 60)):
+            point = rng.randint(-span, span), rng.randint(-span, span)
+            items[point] = rng.randrange(3)
+        grid = grids.SparseGrid(items)
+        for symbols in symbols_list:
+            expected = render_cells(items, symbols)
+            assert grids.render(grid, symbols) == expected
+            assert render_cells(grid, symbols) == expected
+    grid = grids.SparseGrid({(-1, -1): 1, (0, 0): 2, (1, -1): 0})
+    assert grids.render(grid, {1: "#", 2: "@"}) == "#  \n  @\n"
+
+
+@pytest.mark.parametrize(
+    "symbols",
+    [
+        {1: "#", 2: "."},
+        {1: "█", 2: "·"},
+        {1: "#", None: "?"},
+        {"a": "A", (1, 2): "B", None: "é"},
+        {3: "x"},
+    ],
+)
+def test_render_mapping(symbols):
+    """Test rendering a dict against rendering one cell at a time."""
+
+    rng = random.Random(6)
+    values = [1, 2, "a", (1, 2), None]
+    for _ in range(20):
+        grid = {}
+        for _ in range(rng.randint(0, 30)):
+            point = rng.randint(-4, 6), rng.randint(-6, 4)
+            grid[point] = rng.choice(values)
+        assert grids.render(grid, symbols) == render_cells(grid, symbols)
+
+
+def test_render_grid():
+    """Test rendering a Grid, with ASCII and non-ASCII symbols."""
+
+    grid = grids.Grid.from_points([(0, 0), (2, 1)], (3, 2))
+    grid[1, 0] = 2
+    assert grids.render(grid, {1: "#", 2: "o"}) == "# o  \n    #\n"
+    assert grids.render(grid, {1: "█"}) == "█    \n    █\n"
+    assert grids.render(grids.Grid(0, 2), {1: "#"}) == "\n\n"
+
+
+def test_write_pbm():
+    """Test the bytes of a PBM image whose rows are padded."""
+
+    grid = grids.Grid.from_points(
+        [(0, 0), (2, 0), (3, 0), (8, 0), (9, 0), (9, 1)], (10, 2)
+    )
+    grid[1, 1] = 7
+    file = io.BytesIO()
+    grids.write_pbm(grid, file)
+    assert file.getvalue() == b"P4\n10 2\n\xb0\xc0\x40\x40"
+
+    file = io.BytesIO()
+    grids.write_pbm(grids.Grid.from_points([(7, 0)], (8, 1)), file)
+    assert file.getvalue() == b"P4\n8 1\n\x01"
+
+
+def test_write_pgm():
+    """Test the bytes of a PGM image."""
+
+    grid = grids.Grid(3, 2, fill=9)
+    grid[1, 1] = 0
+    file = io.BytesIO()
+    grids.write_pgm(grid, file, max_value=9)
+    assert file.getvalue() == b"P5\n3 2\n9\n\x09\x09\x09\x09\x00\x09"
+
+
+def test_grid_conversions():
+    """Test Grid.select() and conversions against the set from select()."""
+
+    rng = random.Random(9)
+    for _ in range(30):
+        lines = [
+            "".join(rng.choice("#.") for _ in range(rng.randint(0, 7)))
+            for _ in range(rng.randint(0, 6))
+        ]
+        points, size = grids.select_and_measure("#", lines)
+        grid = grids.Grid.select("#", lines)
+        assert grid.size == size
+        assert grid.to_set() == points
+        assert grid.count() == len(points)
+        for y, line in enumerate(lines):
+            # Short lines are padded with zeros up to the longest line.
+            expected = [int(char == "#") for char in line]
+            expected += [0] * (grid.width - len(line))
+            assert list(grid.row(y)) == expected
+        data = "".join(line + "\n" for line in lines)
+        assert grids.Grid.select("#", data).cells == grid.cells
+        assert grids.Grid.from_points(points, size).cells == grid.cells
+        mapping = grid.to_dict()
+        assert len(mapping) == size.x * size.y
+        assert {point for point, value in mapping.items() if value} == points
+        assert grids.Grid.from_dict(mapping, size).cells == grid.cells
+    grid = grids.Grid.from_dict({(1, 0): 3, (0, 1): 200}, (2, 2))
+    assert grid.to_dict() == {(0, 0): 0, (1, 0): 3, (0, 1): 200, (1, 1): 0}
+    assert grids.Grid.from_points([(1, 1)], (2, 2), value=5)[1, 1] == 5
+
+
+def test_grid_index():
+    """Test looking up points inside and outside a grid."""
+
+    grid = grids.Grid(3, 2)
+    for index in range(6):
+        assert grid.index(grid.point(index)) == index
+    for point in [(-1, 0), (3, 0), (0, -1), (0, 2), (5, 5)]:
+        with pytest.raises(IndexError):
+            grid.index(point)
+        with pytest.raises(IndexError):
+            grid[point] = 1
+    grid = grids.Grid(3, 2, wrap=True)
+    assert grid.index((-1, 0)) == 2
+    assert grid.index((3, 1)) == 3
+    assert grid.index((0, -1)) == 3
+    assert grid.index((-4, -3)) == 5
+    assert grid.index((302, 201)) == 5
+    grid[-1, -1] = 7
+    assert grid[2, 1] == grid[5, 3] == 7
+
+
+def test_spiral():
+    """Test spiral_point() and spiral_id() against walking the spiral."""
+
+    point = grids.ORIGIN_2D
+    square_id = 1
+    steps = [grids.RIGHT, grids.UP, grids.LEFT, grids.DOWN]
+    for side in range(80):
+        for _ in range(side // 2 + 1):
+            assert grids.spiral_point(square_id) == point
+            assert grids.spiral_id(point) == square_id
+            point += steps[side % 4]
+            square_id += 1
+    for x in range(-12, 13):
+        for y in range(-12, 13):
+            square_id = grids.spiral_id((x, y))
+            assert grids.spiral_point(square_id) == (x, y)
+    # Each ring ends at its bottom-right corner, on an odd square.
+    assert grids.spiral_point(1000001**2) == (500000, 500000)
+    assert grids.spiral_id((500000, 500000)) == 1000001**2
+    with pytest.raises(ValueError):
+        grids.spiral_point(0)
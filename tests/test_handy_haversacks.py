@@ -0,0 +1,48 @@
+"""Tests of the bag graph for 2020, day 7."""
+
+import sys
+
+import pytest
+
+from adventkit.year2020 import day07_handy_haversacks
+
+
+def chain_rules(length):
+    """Return rules where each bag holds the next one, `length` bags deep."""
+
+    colors = ["shiny gold"] + [f"level {i} red" for i in range(1, length)]
+    lines = [
+        f"{outer} bags contain 1 {inner} bag."
+        for outer, inner in zip(colors, colors[1:])
+    ]
+    lines.append(f"{colors[-1]} bags contain no other bags.")
+    return "\n".join(lines)
+
+
+def test_deep_chain():
+    """Test a chain of rules deeper than the recursion limit."""
+
+    depth = sys.getrecursionlimit() + 100
+    graph = day07_handy_haversacks.parse_rules(chain_rules(depth))
+    count_bags_in = day07_handy_haversacks.count_bags_in
+    assert count_bags_in("shiny gold", graph) == depth - 1
+    assert count_bags_in("level 1 red", graph) == depth - 2
+    last = f"level {depth - 1} red"
+    assert day07_handy_haversacks.count_containers_of(last, graph) == depth - 1
+
+
+def test_cycle():
+    """Test that a cycle in the rules is rejected."""
+
+    rules = "\n".join(
+        [
+            "shiny gold bags contain 2 dark red bags.",
+            "dark red bags contain 1 pale blue bag, 3 dull tan bags.",
+            "dull tan bags contain no other bags.",
+            "pale blue bags contain 1 dark red bag.",
+        ]
+    )
+    graph = day07_handy_haversacks.parse_rules(rules)
+    with pytest.raises(ValueError):
+        day07_handy_haversacks.count_bags_in("shiny gold", graph)
+    assert day07_handy_haversacks.count_bags_in("dull tan", graph) == 0
@@ -0,0 +1,121 @@
+"""Tests of the general-purpose helper tools."""
+
+import array
+import itertools
+import random
+
+import pytest
+
+from adventkit import helpers
+
+
+def test_int_table():
+    """Test the rows and summaries of an IntTable."""
+
+    table = helpers.IntTable([[1, 2], [], [-3, 7, 5]])
+    assert len(table) == 3
+    assert table.tolist() == [[1, 2], [], [-3, 7, 5]]
+    assert table[2].tolist() == [-3, 7, 5]
+    assert table[-1][1] == 7
+    assert [len(row) for row in table] == [2, 0, 3]
+    assert table.row_sums() == [3, 0, 9]
+    with pytest.raises(ValueError):
+        table.row_mins()
+
+    table = helpers.IntTable([[1, 2], [-3, 7, 5]])
+    assert table.row_mins() == [1, -3]
+    assert table.row_maxes() == [2, 7]
+    assert repr(table) == "IntTable([[1, 2], [-3, 7, 5]])"
+    with pytest.raises(IndexError):
+        table[2]
+
+
+def test_int_table_from_arrays():
+    """Test building an IntTable from flat arrays."""
+
+    values = array.array("q", [1, 2, -3, 7, 5])
+    offsets = array.array("q", [0, 2, 2, 5])
+    table = helpers.IntTable.from_arrays(values, offsets)
+    assert table.tolist() == [[1, 2], [], [-3, 7, 5]]
+    assert table.values is values
+    assert table.offsets is offsets
+
+
+def test_int_table_overflow():
+    """Test that values beyond 64 bits are rejected."""
+
+    with pytest.raises(OverflowError):
+        helpers.IntTable([[2**63]])
+
+
+@pytest.mark.parametrize(
+    "text,letters",
+    [
+        ("abz", "abz"),
+        ("aAbB", "ab"),
+        ("Hello, World!", "dehlorw"),
+        ("09 _-\n", ""),
+        ("ÄaéZ", "az"),
+        (b"xYz!", "xyz"),
+        (bytearray(b"QQq"), "q"),
+        ("", ""),
+    ],
+)
+def test_letter_mask(text, letters):
+    """Test that letter_mask() sets one bit per letter, ignoring case."""
+
+    expected = sum(1 << (ord(letter) - ord("a")) for letter in letters)
+    assert helpers.letter_mask(text) == expected
+
+
+def test_popcount():
+    """Test counting the bits of letter masks and other integers."""
+
+    assert helpers.popcount(0) == 0
+    assert helpers.popcount(0b1011) == 3
+    assert helpers.popcount(2**100 - 1) == 100
+    assert helpers.popcount(helpers.letter_mask("The quick fox")) == 11
+    with pytest.raises(ValueError):
+        helpers.popcount(-1)
+
+
+def k_sum_naively(values, k, target):
+    """Return whether `k` items at distinct positions add up to `target`."""
+    return any(sum(c) == target for c in itertools.combinations(values, k))
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 3, 4])
+def test_k_sum(k):
+    """Test k_sum() against trying every combination."""
+
+    rng = random.Random(k)
+    for _ in range(300):
+        values = [rng.randint(-6, 6) for _ in range(rng.randint(0, 8))]
+        target = rng.randint(-15, 15)
+        result = helpers.k_sum(values, k, target)
+        if k_sum_naively(values, k, target):
+            assert len(result) == k
+            assert sum(result) == target
+            remaining = list(values)
+            for item in result:
+                remaining.remove(item)
+        else:
+            assert result is None
+
+
+def test_k_sum_examples():
+    """Test k_sum() with duplicates, missing solutions and invalid k."""
+
+    values = [1721, 979, 366, 299, 675, 1456]
+    assert helpers.k_sum(values, 2, 2020) == (1721, 299)
+    assert sorted(helpers.k_sum(values, 3, 2020)) == [366, 675, 979]
+    assert helpers.k_sum([5, 5], 2, 10) == (5, 5)
+    assert helpers.k_sum([5], 2, 10) is None
+    assert sorted(helpers.k_sum([3, 3, 3, 1], 3, 9)) == [3, 3, 3]
+    assert helpers.k_sum([3, 3, 1], 3, 9) is None
+    assert sorted(helpers.k_sum([-7, 2, -1, 4], 3, -6)) == [-7, -1, 2]
+    assert helpers.k_sum([], 0, 0) == ()
+    assert helpers.k_sum([1, 2], 0, 1) is None
+    assert helpers.k_sum([1, 2], 3, 3) is None
+    with pytest.raises(ValueError):
+        helpers.k_sum([1, 2], -1, 0)
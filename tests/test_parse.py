@@ -0,0 +1,139 @@
+"""Tests of the parsing tools."""
+
+import pytest
+
+from adventkit import helpers, parse
+
+
+def test_row_parser_str():
+    """Test parsing rows from a string."""
+
+    parse_rows = parse.row_parser("int-int str: str")
+    rows = parse_rows("1-3 a: abc\n2-9 c: ccc\n")
+    assert list(rows) == [(1, 3, "a", "abc"), (2, 9, "c", "ccc")]
+
+
+def test_row_parser_bytes():
+    """Test that values parsed from bytes are ints and strings."""
+
+    parse_rows = parse.row_parser("int-int str: str")
+    rows = parse_rows(b"1-3 a: abc\r\n2-9 c: ccc")
+    assert list(rows) == [(1, 3, "a", "abc"), (2, 9, "c", "ccc")]
+
+
+def test_row_parser_row_sep():
+    """Test splitting rows at a separator instead of at line breaks."""
+
+    parse_rows = parse.row_parser("str int")
+    rows = parse_rows("nop +0, acc +1,\njmp -4", row_sep=",")
+    assert list(rows) == [("nop", 0), ("acc", 1), ("jmp", -4)]
+
+
+def test_row_parser_signed_int():
+    """Test that 'int' matches integers with either sign."""
+
+    parse_rows = parse.row_parser("<x=int, y=int>")
+    rows = parse_rows("<x=-2, y=+15>\n<x=0,  y=7>")
+    assert list(rows) == [(-2, 15), (0, 7)]
+
+
+def test_row_parser_words_containing_placeholders():
+    """Test that 'int' and 'str' inside other words match literally."""
+
+    parse_rows = parse.row_parser("print int strength str")
+    rows = parse_rows("print 3 strength abc")
+    assert list(rows) == [(3, "abc")]
+
+
+def test_row_parser_mismatch():
+    """Test that a row that doesn't match the schema raises an error."""
+
+    rows = parse.row_parser("int-int")("1-2\n3+4\n5-6")
+    assert next(rows) == (1, 2)
+    with pytest.raises(ValueError):
+        next(rows)
+
+
+@pytest.mark.parametrize("text", ["-3 T-4,5-10", b"-3 T-4,5-10"])
+def test_iter_ints(text):
+    """Test that iter_ints() agrees with ints() for strings and bytes."""
+    assert list(parse.iter_ints(text)) == [-3, -4, 5, 10]
+
+
+def test_iter_strings_and_mixed_values():
+    """Test that values extracted from bytes are decoded to strings."""
+
+    assert list(parse.iter_strings(b"53_7A,a735")) == ["53", "7A", "a735"]
+    values = parse.iter_mixed_values(b"-1-99 A7: Q-8,-9")
+    assert list(values) == [-1, 99, "A", 7, "Q", 8, -9]
+
+
+@pytest.mark.parametrize("text", ["1 2\r\n\n3\r4\n", b"1 2\r\n\n3\r4\n"])
+def test_iter_int_rows(text):
+    """Test that all kinds of line breaks separate rows."""
+    assert list(parse.iter_int_rows(text)) == [[1, 2], [], [3], [4]]
+
+
+def test_iter_rows_with_separators():
+    """Test the lazy row and table functions with separators."""
+
+    rows = parse.iter_string_rows(b"a b;c", row_sep=";")
+    assert list(rows) == [["a", "b"], ["c"]]
+    text = "a 1,b 2\n\nc 3"
+    tables = parse.iter_mixed_tables(text, table_sep="\n\n", row_sep=",")
+    assert list(tables) == parse.mixed_tables(
+        text, table_sep="\n\n", row_sep=","
+    )
+
+
+@pytest.mark.parametrize("text", ["1 -2, 3", b"1 -2, 3"])
+def test_int_array(text):
+    """Test that int_array() returns a compact array of the integers."""
+
+    values = parse.int_array(text)
+    assert values.typecode == "q"
+    assert values.tolist() == [1, -2, 3]
+
+
+def test_int_array_overflow():
+    """Test that int_array() falls back to a list for large integers."""
+
+    text = f"1 {2**63} -{2**63 + 1}"
+    assert parse.int_array(text) == [1, 2**63, -(2**63) - 1]
+
+
+def test_compact_int_rows():
+    """Test that int_rows() falls back to lists for large integers."""
+
+    table = parse.int_rows("5 1 9 5\n7 5 3\n", compact=True)
+    assert isinstance(table, helpers.IntTable)
+    assert table.tolist() == [[5, 1, 9, 5], [7, 5, 3]]
+    rows = parse.int_rows(f"1 {2**63}", compact=True)
+    assert rows == [[1, 2**63]]
+
+
+@pytest.mark.parametrize("text", ["1 -2, 3", b"1 -2, 3", ""])
+def test_int_ndarray(text):
+    """Test that int_ndarray() returns an int64 array of the integers."""
+
+    numpy = pytest.importorskip("numpy")
+    values = parse.int_ndarray(text)
+    assert values.dtype == numpy.int64
+    assert values.tolist() == parse.ints(text)
+
+
+def test_int_ndarray_overflow():
+    """Test that int_ndarray() falls back to objects for large integers."""
+
+    pytest.importorskip("numpy")
+    values = parse.int_ndarray(f"1 {2**63} -{2**63 + 1}")
+    assert values.dtype == object
+    assert values.tolist() == [1, 2**63, -(2**63) - 1]
+
+
+def test_int_ndarray_without_numpy(monkeypatch):
+    """Test that int_ndarray() needs NumPy."""
+
+    monkeypatch.setattr(parse, "numpy", None)
+    with pytest.raises(ImportError):
+        parse.int_ndarray("1 2")
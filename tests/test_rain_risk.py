@@ -0,0 +1,73 @@
+"""Tests of the navigation transforms for 2020, day 12."""
+
+import itertools
+
+import pytest
+
+from adventkit import grids
+from adventkit.year2020 import day12_rain_risk
+
+
+INSTRUCTIONS = [
+    ("F", 10),
+    ("N", 3),
+    ("F", 7),
+    ("R", 90),
+    ("F", 11),
+    ("L", 270),
+    ("W", 4),
+    ("R", 180),
+    ("F", 2),
+    ("S", 5),
+]
+
+START_STEPS = [
+    (False, grids.EAST),
+    (True, grids.EAST * 10 + grids.NORTH),
+]
+
+
+def replay(instructions, step, waypoint_mode):
+    """Return the position and step after following the instructions."""
+
+    pos = grids.ORIGIN_2D
+    for action, value in instructions:
+        if action == "L":
+            step = step.rotate_left(value // 90)
+        elif action == "R":
+            step = step.rotate_right(value // 90)
+        elif action == "F":
+            pos += step * value
+        elif waypoint_mode:
+            step += day12_rain_risk.DIRECTIONS[action] * value
+        else:
+            pos += day12_rain_risk.DIRECTIONS[action] * value
+    return pos, step
+
+
+@pytest.mark.parametrize("waypoint_mode,step", START_STEPS)
+def test_prefix_transforms(waypoint_mode, step):
+    """Test that each prefix transform matches replaying the prefix."""
+
+    transforms = day12_rain_risk.prefix_transforms(INSTRUCTIONS, waypoint_mode)
+    assert len(transforms) == len(INSTRUCTIONS) + 1
+    for k, transform in enumerate(transforms):
+        result = day12_rain_risk.apply_transform(
+            transform, grids.ORIGIN_2D, step
+        )
+        assert result == replay(INSTRUCTIONS[:k], step, waypoint_mode)
+
+
+@pytest.mark.parametrize("waypoint_mode,step", START_STEPS)
+@pytest.mark.parametrize("times", [0, 1, 2, 5, 8])
+def test_repeated(waypoint_mode, step, times):
+    """Test that a repeated transform matches replaying the repetitions."""
+
+    transform = day12_rain_risk.prefix_transforms(
+        INSTRUCTIONS, waypoint_mode
+    )[-1]
+    result = day12_rain_risk.apply_transform(
+        day12_rain_risk.repeated(transform, times), grids.ORIGIN_2D, step
+    )
+    repetitions = itertools.chain.from_iterable([INSTRUCTIONS] * times)
+    assert result == replay(repetitions, step, waypoint_mode)
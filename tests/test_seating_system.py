@@ -0,0 +1,40 @@
+"""Tests of the NumPy sight index for 2020, day 11."""
+
+import pytest
+
+from adventkit import grids
+from adventkit.year2020 import day11_seating_system
+
+
+pytest.importorskip("numpy")
+
+
+def test_sight_index(random_grids, walk_rays):
+    """Test sight_index() against walking a ray in each direction."""
+
+    for grid in random_grids(seed=2):
+        seats = [index for index, value in enumerate(grid.cells) if value]
+        numbers = {index: number for number, index in enumerate(seats)}
+        rays = walk_rays(grid, grids.ALL_STEPS)
+        expected = [sorted(numbers[other] for other in rays[i]) for i in seats]
+        index = day11_seating_system.sight_index(grid)
+        assert index.shape == (len(seats), 8)
+        rows = [sorted(n for n in row if n != len(seats)) for row in index]
+        assert rows == expected, grid.cells
+
+
+def test_solve(random_grids, capsys, monkeypatch):
+    """Test that the NumPy path gives the same answers as pure Python."""
+
+    for grid in random_grids(seed=3, trials=3):
+        lines = [
+            "".join("L" if value else "." for value in grid.row(y))
+            for y in range(grid.height)
+        ]
+        data = "".join(line + "\n" for line in lines)
+        day11_seating_system.solve(data)
+        vectorized = capsys.readouterr().out
+        monkeypatch.setattr(day11_seating_system, "numpy", None)
+        day11_seating_system.solve(data)
+        monkeypatch.undo()
+        assert vectorized == capsys.readouterr().out, data
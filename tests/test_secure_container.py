@@ -0,0 +1,71 @@
+"""Tests of the password counting for 2019, day 4."""
+
+import itertools
+import random
+
+import pytest
+
+from adventkit.year2019 import day04_secure_container
+
+
+def count_naively(low, high):
+    """Count the passwords in a range by checking each number."""
+
+    if len(low) == len(high):
+        passwords = (
+            str(n).zfill(len(low)) for n in range(int(low), int(high) + 1)
+        )
+    else:
+        passwords = (str(n) for n in range(int(low), int(high) + 1))
+    simple_count = 0
+    better_count = 0
+    for password in passwords:
+        if list(password) != sorted(password):
+            continue
+        runs = [len(list(run)) for _, run in itertools.groupby(password)]
+        simple_count += max(runs) >= 2
+        better_count += 2 in runs
+    return simple_count, better_count
+
+
+@pytest.mark.parametrize(
+    "low,high",
+    [
+        ("111111", "111111"),
+        ("123444", "123444"),
+        ("112233", "112233"),
+        ("234208", "265275"),
+        ("100000", "199999"),
+        ("000000", "011111"),
+        ("000120", "004567"),
+        ("0", "9"),
+        ("7", "4321"),
+        ("99", "1234"),
+        ("5", "55"),
+        ("321", "321"),
+        ("987", "1000"),
+        ("200", "199"),
+        ("1000", "999"),
+    ],
+)
+def test_count_in_range(low, high):
+    """Test count_in_range() against checking every number in the range."""
+
+    result = day04_secure_container.count_in_range(low, high)
+    assert result == count_naively(low, high)
+
+
+def test_random_ranges():
+    """Test count_in_range() on random ranges of up to four digits."""
+
+    rng = random.Random(0)
+    for _ in range(200):
+        length = rng.randint(1, 4)
+        low, high = sorted(rng.randrange(10**length) for _ in range(2))
+        low = str(low).zfill(length)
+        high = str(high).zfill(length)
+        if rng.random() < 0.3:
+            high = str(rng.randint(int(low) + 1, 20000))
+            low = low.lstrip("0") or "0"
+        result = day04_secure_container.count_in_range(low, high)
+        assert result == count_naively(low, high), (low, high)
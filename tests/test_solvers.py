@@ -2,6 +2,7 @@
 
 import pathlib
 import re
+import sys
 import typing
 
 import pytest
@@ -12,6 +13,12 @@ from adventkit.year2017 import (
     day03_spiral_memory,
     day04_passphrases,
 )
+from adventkit.year2019 import day03_crossed_wires
+from adventkit.year2020 import (
+    day07_handy_haversacks,
+    day08_handheld_halting,
+    day11_seating_system,
+)
 
 
 INDENT_WIDTH = 4
@@ -35,6 +42,10 @@ def arg_combinations():
         (day02_corruption_checksum, 2017, 2),
         (day03_spiral_memory, 2017, 3),
         (day04_passphrases, 2017, 4),
+        (day03_crossed_wires, 2019, 3),
+        (day07_handy_haversacks, 2020, 7),
+        (day08_handheld_halting, 2020, 8),
+        (day11_seating_system, 2020, 11),
     ]
     for module, year, day in values:
         _, _, puzzle_label = module.__name__.partition("_")
@@ -57,6 +68,19 @@ def test(solve, year, day, puzzle_label, capsys, subtests):
             assert result == case.expected, f"case {case.key} ({case.label})"
 
 
+@pytest.mark.parametrize("solve,year,day,puzzle_label", arg_combinations())
+def test_without_numpy(
+    solve, year, day, puzzle_label, capsys, subtests, monkeypatch
+):
+    """Test a solver's pure-Python code even if NumPy is installed."""
+
+    module = sys.modules[solve.__module__]
+    if getattr(module, "numpy", None) is None:
+        pytest.skip("solver has no NumPy code or NumPy isn't installed")
+    monkeypatch.setattr(module, "numpy", None)
+    test(solve, year, day, puzzle_label, capsys, subtests)
+
+
 def get_cases(year, day, puzzle_label):
     """Return a list of test cases."""
 
@@ -0,0 +1,68 @@
+"""Tests of the orbit tree for 2019, day 6."""
+
+import itertools
+import random
+
+from adventkit.year2019 import day06_universal_orbit_map
+
+
+def random_orbits(rng, size):
+    """Return a random orbit map and a dict of the objects' parents."""
+
+    parents = {}
+    names = ["COM"]
+    for i in range(1, size):
+        # Favor recent objects, so that some branches get deep.
+        parent = names[max(0, i - 1 - int(rng.expovariate(0.3)))]
+        names.append(f"N{i}")
+        parents[names[-1]] = parent
+    orbits = [[parent, name] for name, parent in parents.items()]
+    rng.shuffle(orbits)
+    return orbits, parents
+
+
+def ancestors(name, parents):
+    """Return the path from an object up to the root, including both."""
+
+    path = [name]
+    while path[-1] in parents:
+        path.append(parents[path[-1]])
+    return path
+
+
+def test_common_ancestor_and_distance():
+    """Test the tree against walking up from both objects."""
+
+    rng = random.Random(0)
+    for size in [1, 2, 3, 5, 17, 64, 200]:
+        orbits, parents = random_orbits(rng, size)
+        tree = day06_universal_orbit_map.OrbitTree(orbits)
+        names = ["COM", *parents]
+        pairs = list(itertools.combinations_with_replacement(names, 2))
+        for name_a, name_b in rng.sample(pairs, min(len(pairs), 300)):
+            path_a = ancestors(name_a, parents)
+            path_b = ancestors(name_b, parents)
+            common = next(name for name in path_a if name in path_b)
+            distance = path_a.index(common) + path_b.index(common)
+            assert tree.common_ancestor(name_a, name_b) == common
+            assert tree.common_ancestor(name_b, name_a) == common
+            assert tree.distance(name_a, name_b) == distance
+        depths = [len(ancestors(name, parents)) - 1 for name in names]
+        assert day06_universal_orbit_map.count_orbits(tree) == sum(depths)
+
+
+def test_chain():
+    """Test same-depth and ancestor pairs on a long chain with one branch."""
+
+    orbits = [["COM", "A1"]]
+    orbits += [[f"A{i}", f"A{i + 1}"] for i in range(1, 100)]
+    orbits += [["A40", "B41"]]
+    orbits += [[f"B{i}", f"B{i + 1}"] for i in range(41, 100)]
+    tree = day06_universal_orbit_map.OrbitTree(orbits)
+    assert tree.common_ancestor("A100", "B100") == "A40"
+    assert tree.distance("A100", "B100") == 120
+    assert tree.common_ancestor("A64", "A100") == "A64"
+    assert tree.distance("A100", "A64") == 36
+    assert tree.common_ancestor("COM", "B77") == "COM"
+    assert tree.distance("B77", "COM") == 77
+    assert tree.distance("A41", "B41") == 2